@@ -284,9 +284,12 @@ class DatabaseManager:
     """SQLite database manager for the financial data pipeline."""
 
     def __init__(self, db_path: str = DEFAULT_DB_PATH):
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # "file:..." paths are SQLite URIs (e.g. shared in-memory DBs in tests)
+        uri = db_path.startswith("file:")
+        if not uri:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = sqlite3.connect(db_path, uri=uri)
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA foreign_keys=ON")
         self.conn.row_factory = sqlite3.Row
@@ -303,6 +306,11 @@ class DatabaseManager:
                 self.conn.execute(f"ALTER TABLE news_articles ADD COLUMN {col} {typedef}")
             except sqlite3.OperationalError:
                 pass  # column already exists
+        # Partial index over just the unenriched rows, so the enrichment query
+        # doesn't rescan the whole table (needs sentiment_source to exist first)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_na_unenriched ON news_articles(id) WHERE sentiment_source = ''"
+        )
         self.conn.commit()
 
     def close(self):
@@ -735,7 +743,8 @@ class DatabaseManager:
         if force:
             sql = "SELECT id, title, description, provider, sentiment_source FROM news_articles"
         else:
-            sql = "SELECT id, title, description, provider, sentiment_source FROM news_articles WHERE sentiment_source = ''"
+            sql = ("SELECT id, title, description, provider, sentiment_source FROM news_articles "
+                   "WHERE sentiment_source = '' ORDER BY id")
         if limit:
             sql += f" LIMIT {int(limit)}"
         cur = self.conn.execute(sql)
@@ -748,6 +757,17 @@ class DatabaseManager:
             (sentiment, label, source, article_id),
         )
 
+    def update_article_sentiments(self, updates: list[tuple]) -> None:
+        """Bulk version of update_article_sentiment.
+
+        Args:
+            updates: (sentiment, label, source, article_id) tuples.
+        """
+        self.conn.executemany(
+            "UPDATE news_articles SET sentiment = ?, sentiment_label = ?, sentiment_source = ? WHERE id = ?",
+            updates,
+        )
+
     def get_news_latest_fetch(self, provider: str) -> str | None:
         """Return the most recent fetched_at timestamp for a provider, or None."""
         cur = self.conn.execute(
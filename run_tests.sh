@@ -1 +1 @@
-pytest tests/ -v
\ No newline at end of file
+pytest tests/ -v -n auto
\ No newline at end of file
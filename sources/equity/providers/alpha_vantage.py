@@ -5,6 +5,7 @@ Official API documentation: https://www.alphavantage.co/documentation/
 """
 
 import os
+import threading
 import time
 import requests
 from typing import List, Dict, Optional
@@ -33,13 +34,15 @@ class AlphaVantageProvider(EquityDataProvider):
     CALLS_PER_MINUTE = 5
     SECONDS_BETWEEN_CALLS = 60 / CALLS_PER_MINUTE
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         Initialize Alpha Vantage provider.
         
         Args:
             api_key: Alpha Vantage API key. If not provided, reads from
                     ALPHA_VANTAGE_API_KEY environment variable.
+            session: Existing requests.Session to reuse (keeps its pooled
+                    connections). A new session is created if not provided.
         """
         if not api_key:
             api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
@@ -51,17 +54,22 @@ class AlphaVantageProvider(EquityDataProvider):
             )
         
         super().__init__(api_key)
-        self.session = requests.Session()
+        self.session = session if session is not None else requests.Session()
         self.last_call_time = 0
+        self._rate_lock = threading.Lock()
     
     def _rate_limit(self):
-        """Enforce rate limiting between API calls."""
-        elapsed = time.time() - self.last_call_time
-        if elapsed < self.SECONDS_BETWEEN_CALLS:
-            sleep_time = self.SECONDS_BETWEEN_CALLS - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        self.last_call_time = time.time()
+        """
+        Enforce rate limiting between API calls. The lock is held through the sleep,
+        so callers sharing one provider across threads are spaced out one at a time.
+        """
+        with self._rate_lock:
+            elapsed = time.time() - self.last_call_time
+            if elapsed < self.SECONDS_BETWEEN_CALLS:
+                sleep_time = self.SECONDS_BETWEEN_CALLS - elapsed
+                logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
+                time.sleep(sleep_time)
+            self.last_call_time = time.time()
     
     def _make_request(self, params: Dict) -> Dict:
         """
@@ -11,6 +11,7 @@ Usage:
 """
 
 import argparse
+import functools
 import sys
 from pathlib import Path
 
@@ -22,17 +23,28 @@ from database import DatabaseManager
 from utils import log
 
 
+@functools.lru_cache(maxsize=1)
+def _get_analyzer() -> SentimentIntensityAnalyzer:
+    """Shared VADER analyzer; the lexicon is parsed once per process."""
+    return SentimentIntensityAnalyzer()
+
+
+def _label(compound: float) -> str:
+    """Map a VADER compound score to positive / negative / neutral (±0.05 cutoffs)."""
+    if compound >= 0.05:
+        return "positive"
+    if compound <= -0.05:
+        return "negative"
+    return "neutral"
+
+
 class SentimentEnricher:
     """Scores news articles with VADER sentiment and updates the DB."""
 
     def __init__(self, db_path: str | None = None, batch_size: int = 500):
         self.db = DatabaseManager(db_path) if db_path else DatabaseManager()
         self.batch_size = batch_size
-        self.analyzer = self._init_vader()
-
-    @staticmethod
-    def _init_vader() -> SentimentIntensityAnalyzer:
-        return SentimentIntensityAnalyzer()
+        self.analyzer = _get_analyzer()
 
     def score(self, text: str) -> dict:
         """Score a text string with VADER.
@@ -40,15 +52,8 @@ class SentimentEnricher:
         Returns:
             dict with 'compound' (float, -1 to +1) and 'label' (str).
         """
-        scores = self.analyzer.polarity_scores(text)
-        compound = scores["compound"]
-        if compound >= 0.05:
-            label = "positive"
-        elif compound <= -0.05:
-            label = "negative"
-        else:
-            label = "neutral"
-        return {"compound": compound, "label": label}
+        compound = self.analyzer.polarity_scores(text)["compound"]
+        return {"compound": compound, "label": _label(compound)}
 
     def enrich_articles(self, limit: int | None = None, force: bool = False) -> int:
         """Fetch unenriched articles, score them, and update the DB.
@@ -64,28 +69,24 @@ class SentimentEnricher:
         if not articles:
             return 0
 
-        enriched = 0
-        for i, article in enumerate(articles):
-            title = article.get("title") or ""
-            description = article.get("description") or ""
-            text = (title + " " + description).strip()
-
-            result = self.score(text)
-            self.db.update_article_sentiment(
-                article_id=article["id"],
-                sentiment=result["compound"],
-                label=result["label"],
-                source="vader",
-            )
-            enriched += 1
-
-            # Commit in batches
-            if enriched % self.batch_size == 0:
-                self.db.conn.commit()
-
-        # Final commit
-        self.db.conn.commit()
-        return enriched
+        # Score everything first, then write back in batch_size chunks with
+        # one executemany + commit per chunk
+        # Case is kept as-is: VADER boosts ALL-CAPS words
+        polarity_scores = self.analyzer.polarity_scores
+        texts = [
+            f"{a.get('title') or ''} {a.get('description') or ''}".strip()
+            for a in articles
+        ]
+        updates = []
+        for article, text in zip(articles, texts):
+            compound = polarity_scores(text)["compound"]
+            updates.append((compound, _label(compound), "vader", article["id"]))
+
+        for start in range(0, len(updates), self.batch_size):
+            self.db.update_article_sentiments(updates[start:start + self.batch_size])
+            self.db.conn.commit()
+
+        return len(updates)
 
 
 def main():
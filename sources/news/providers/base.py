@@ -5,7 +5,21 @@ All news data providers must implement this interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def decode_json(resp) -> Any:
+    """Decode a response body, using orjson on the raw bytes when it is installed"""
+    if orjson is not None:
+        content = getattr(resp, "content", None)
+        if isinstance(content, (bytes, bytearray, memoryview, str)):
+            return orjson.loads(content)
+    return resp.json()
 
 
 class NewsDataProvider(ABC):
@@ -6,12 +6,14 @@ https://finnhub.io/docs/api/general-news
 https://finnhub.io/docs/api/market-news
 """
 
+import functools
 import logging
 import os
+import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from .base import NewsDataProvider, ProviderError, RateLimitError, NoDataError
+from .base import NewsDataProvider, ProviderError, RateLimitError, NoDataError, decode_json
 
 import sys
 from pathlib import Path
@@ -23,6 +25,15 @@ logger = logging.getLogger(__name__)
 FINNHUB_BASE = "https://finnhub.io/api/v1"
 
 
+@functools.lru_cache(maxsize=64)
+def _query_pattern(query: str) -> Optional[re.Pattern]:
+    """Alternation of the lowercased query terms (substring match), or None if empty."""
+    terms = query.lower().split()
+    if not terms:
+        return None
+    return re.compile("|".join(map(re.escape, terms)))
+
+
 class FinnhubProvider(NewsDataProvider):
     """
     Finnhub news data provider.
@@ -74,7 +85,7 @@ class FinnhubProvider(NewsDataProvider):
         if resp.status_code == 429:
             raise RateLimitError("Finnhub rate limit exceeded (60 calls/min)")
 
-        data = resp.json()
+        data = decode_json(resp)
         if isinstance(data, dict) and data.get("error"):
             raise ProviderError(f"Finnhub error: {data['error']}")
 
@@ -82,17 +93,18 @@ class FinnhubProvider(NewsDataProvider):
             return []
 
         # Filter by query terms (client-side)
-        query_terms = query.lower().split()
+        pattern = _query_pattern(query)
+        if pattern is None:
+            return []
+        match = pattern.search
         now = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
         articles = []
 
         for item in data:
-            title = (item.get("headline") or "").lower()
-            summary = (item.get("summary") or "").lower()
-            text = title + " " + summary
+            text = f"{item.get('headline') or ''} {item.get('summary') or ''}".lower()
 
             # Check if any query term appears
-            if not any(term in text for term in query_terms):
+            if not match(text):
                 continue
 
             # Check date range
@@ -155,7 +167,7 @@ class FinnhubProvider(NewsDataProvider):
         if resp.status_code == 429:
             raise RateLimitError("Finnhub rate limit exceeded")
 
-        data = resp.json()
+        data = decode_json(resp)
         if not isinstance(data, list):
             return []
 
@@ -11,7 +11,9 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from .base import NewsDataProvider, ProviderError, NoDataError
+import numpy as np
+
+from .base import NewsDataProvider, ProviderError, NoDataError, decode_json
 
 import sys
 from pathlib import Path
@@ -74,14 +76,15 @@ class GdeltProvider(NewsDataProvider):
         if not resp:
             raise ProviderError("Failed to fetch from GDELT API")
 
-        data = resp.json()
+        data = decode_json(resp)
         raw_articles = data.get("articles", [])
         if not raw_articles:
             return []
 
         now = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        sentiments = self._extract_sentiments(raw_articles)
         articles = []
-        for a in raw_articles:
+        for a, sentiment in zip(raw_articles, sentiments):
             articles.append({
                 "provider": "gdelt",
                 "source_name": a.get("domain", ""),
@@ -91,8 +94,8 @@ class GdeltProvider(NewsDataProvider):
                 "published_at": self._parse_gdelt_datetime(a.get("seendate", "")),
                 "fetched_at": now,
                 "category": category,
-                "sentiment": self._extract_sentiment(a),
-                "sentiment_source": "gdelt_tone" if self._extract_sentiment(a) is not None else "",
+                "sentiment": sentiment,
+                "sentiment_source": "gdelt_tone" if sentiment is not None else "",
                 "topics": [category] if category else [],
                 "image_url": a.get("socialimage", ""),
             })
@@ -124,13 +127,20 @@ class GdeltProvider(NewsDataProvider):
         Normalizes the raw GDELT tone (~-100 to +100) to -1..+1 scale
         so all sentiment values in the DB are comparable regardless of source.
         """
-        tone = article.get("tone", "")
-        if tone:
-            try:
-                # GDELT tone is comma-separated: tone,pos,neg,polarity,...
-                parts = str(tone).split(",")
-                raw = float(parts[0])
-                return max(-1.0, min(1.0, raw / 100.0))
-            except (ValueError, IndexError):
-                pass
-        return None
+        return self._extract_sentiments([article])[0]
+
+    def _extract_sentiments(self, articles: List[dict]) -> List[Optional[float]]:
+        """Batch form of _extract_sentiment: parse each raw tone once, then
+        normalize and clamp the whole response in one NumPy pass.
+        Missing or unparseable tones come back as None."""
+        raw = np.full(len(articles), np.nan)
+        for i, article in enumerate(articles):
+            tone = article.get("tone", "")
+            if tone:
+                try:
+                    # GDELT tone is comma-separated: tone,pos,neg,polarity,...
+                    raw[i] = float(str(tone).split(",", 1)[0])
+                except ValueError:
+                    pass
+        scaled = np.clip(raw / 100.0, -1.0, 1.0)
+        return [None if v != v else v for v in scaled.tolist()]
@@ -10,7 +10,7 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from .base import NewsDataProvider, ProviderError, RateLimitError, NoDataError
+from .base import NewsDataProvider, ProviderError, RateLimitError, NoDataError, decode_json
 
 import sys
 from pathlib import Path
@@ -78,7 +78,7 @@ class NewsApiProvider(NewsDataProvider):
         if not resp:
             raise ProviderError("Failed to fetch from NewsAPI")
 
-        data = resp.json()
+        data = decode_json(resp)
         if data.get("status") == "error":
             code = data.get("code", "")
             if code == "rateLimited":
@@ -123,7 +123,7 @@ class NewsApiProvider(NewsDataProvider):
         if not resp:
             raise ProviderError("Failed to fetch headlines from NewsAPI")
 
-        data = resp.json()
+        data = decode_json(resp)
         if data.get("status") == "error":
             raise ProviderError(f"NewsAPI error: {data.get('message', '')}")
 
@@ -1,30 +1,189 @@
+import bisect
+import gzip
+import hashlib
 import json
 import os
 import sys
 import re
+import tempfile
+import time
+import zlib
 from pathlib import Path
 from collections import defaultdict
-from difflib import SequenceMatcher
 
 # Add modules from base repo
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from utils.session import RequestSession
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Keyword groups for Phase 2 categorization (one alternation per group)
+_CASH_FLOW_RE = re.compile(r"cash flow|operating activities")
+_INCOME_RE = re.compile(r"revenue|income|expense|profit|loss")
+_NOT_INCOME_RE = re.compile(r"deferred|payable|receivable")
+_EQUITY_RE = re.compile(r"equity|stock|shares")
+_LIABILITY_RE = re.compile(r"liability|payable")
+_BALANCE_SHEET_RE = re.compile(r"balance sheet|inventory|debt")
+_DEI_RE = re.compile(r"entity|document")
+_PERIOD_RE = re.compile(r"during|for the period|revenue|expense|income|flow|increase|decrease")
+_CONCEPT_RES = [
+    (re.compile(r"revenue|sales"), "Revenue"),
+    (re.compile(r"expense|cost"), "Expense"),
+    (re.compile(r"asset|receivable|inventory"), "Asset"),
+    (re.compile(r"liability|payable|debt"), "Liability"),
+    (re.compile(r"equity|stock|capital"), "Equity"),
+    (re.compile(r"cash"), "Cash"),
+    (re.compile(r"tax"), "Tax"),
+    (re.compile(r"share-based"), "Share-Based Compensation"),
+    (re.compile(r"earnings per share|eps"), "Earnings Per Share"),
+]
+
+# Availability tier lower bounds (percent); bisect_right keeps ">= bound" semantics
+_TIER_THRESHOLDS = [10, 30, 50, 70, 90]
+_TIERS = ["very_rare", "rare", "moderate", "common", "very_common", "universal"]
+
+TIER_DESCRIPTIONS = {
+    "universal": "90-100% of companies (highly reliable for cross-company analysis)",
+    "very_common": "70-89% of companies (good for most comparisons)",
+    "common": "50-69% of companies (useful but may have gaps)",
+    "moderate": "30-49% of companies (limited coverage)",
+    "rare": "10-29% of companies (sparse data)",
+    "very_rare": "<10% of companies (company-specific or niche)"
+}
+
+# Fuzzy field-name matching: minimum shared trigrams and Jaccard similarity
+SIMILAR_MIN_SHARED_TRIGRAMS = 4
+SIMILAR_MIN_JACCARD = 0.5
+
+# Cached companyfacts responses are reused for this long before re-fetching
+XBRL_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Statement-type labels shared by every categorized field (interned literals)
+STMT_CASH_FLOW = "Cash Flow Statement"
+STMT_INCOME = "Income Statement"
+STMT_EQUITY = "Balance Sheet - Equity"
+STMT_ASSETS = "Balance Sheet - Assets"
+STMT_LIABILITIES = "Balance Sheet - Liabilities"
+STMT_BALANCE_SHEET = "Balance Sheet"
+STMT_DEI = "Document & Entity Information"
+STMT_OTHER = "Other/Footnotes"
+
+def _trigrams(name):
+    """Lowercase character trigrams of a field name"""
+    s = name.lower()
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+def _build_trigram_index(names):
+    """Inverted index: trigram -> set of field names containing it"""
+    index = defaultdict(set)
+    for name in names:
+        for gram in _trigrams(name):
+            index[gram].add(name)
+    return index
+
+def _availability_tier(availability_pct):
+    """Tier name for an availability percentage; each tier includes its lower bound"""
+    return _TIERS[bisect.bisect_right(_TIER_THRESHOLDS, availability_pct)]
+
+def _priority_score(item):
+    """Sort key for (field_name, priority_info) pairs"""
+    return item[1]["priority_score"]
+
+def load_json(path):
+    """Load a JSON file, using orjson when it is installed"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+def dump_json(obj, path):
+    """
+    Write obj as indented JSON, using orjson when it is installed. A {path}.sha
+    sidecar records the payload's blake2b digest plus the size and mtime_ns of the
+    file as written; the write is skipped only if the digest matches and the file on
+    disk still has that size and mtime (so hand edits or restores get rewritten).
+    """
+    if orjson is not None:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(obj, indent=2).encode('utf-8')
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    sidecar = f"{path}.sha"
+    try:
+        st = os.stat(path)
+        with open(sidecar, 'r') as f:
+            if f.read().split() == [digest, str(st.st_size), str(st.st_mtime_ns)]:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(payload)
+    st = os.stat(path)
+    with open(sidecar, 'w') as f:
+        f.write(f"{digest} {st.st_size} {st.st_mtime_ns}")
+    return True
+
+def write_bytes_atomic(path, data):
+    """
+    Write data to path via a uniquely named temp file in the same directory, then
+    os.replace it into place. Readers never see a partial file, and concurrent
+    writers of one path (tickers sharing a CIK) each use their own temp file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+        tmp_name = f.name
+        try:
+            f.write(data)
+        except BaseException:
+            f.close()
+            os.unlink(tmp_name)
+            raise
+    os.replace(tmp_name, path)
+
+def fetch_companyfacts_cached(reqsesh, url, cik, cache_dir, rate_limiter=None):
+    """
+    Return raw companyfacts bytes, served from {cache_dir}/{cik}.json.gz while fresh.
+    A cache file that fails to decompress is treated as a miss and re-fetched.
+    """
+    path = Path(cache_dir) / f"{cik}.json.gz"
+    if path.exists() and time.time() - path.stat().st_mtime < XBRL_CACHE_TTL_SECONDS:
+        try:
+            return gzip.decompress(path.read_bytes())
+        except (OSError, EOFError, zlib.error):
+            pass
+
+    res = reqsesh.get(url, rate_limiter=rate_limiter)
+    if res is None or res.status_code != 200:
+        return None
+
+    write_bytes_atomic(path, gzip.compress(res.content))
+    return res.content
+
 class FieldAnalysisPipeline:
     def __init__(self):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.root_dir = str(Path(self.base_dir).parent.parent.parent)
-        self.config_path = os.path.join(self.root_dir, "config/cik.json")
+        root = self.root_dir
+        self.config_path = f"{root}/config/cik.json"
+        self.xbrl_cache_dir = f"{root}/cache/xbrl"
+        self.company_metadata_path = f"{root}/config/company_metadata.json"
         self.output_files = {
-            "catalog": os.path.join(self.root_dir, "reports/field_catalog.json"),
-            "categories": os.path.join(self.root_dir, "reports/field_categories.json"),
-            "availability": os.path.join(self.root_dir, "reports/field_availability_report.json"),
-            "mapping": os.path.join(self.root_dir, "reports/field_mapping.json"),
-            "priority": os.path.join(self.root_dir, "reports/field_priority.json"),
-            "metadata": os.path.join(self.root_dir, "reports/field_catalog_metadata.json"),
-            "output_txt": os.path.join(self.root_dir, "reports/output.txt")
+            "catalog": f"{root}/reports/field_catalog.json",
+            "categories": f"{root}/reports/field_categories.json",
+            "availability": f"{root}/reports/field_availability_report.json",
+            "availability_parquet": f"{root}/reports/field_analysis.parquet",
+            "mapping": f"{root}/reports/field_mapping.json",
+            "priority": f"{root}/reports/field_priority.json",
+            "metadata": f"{root}/reports/field_catalog_metadata.json",
+            "output_txt": f"{root}/reports/output.txt"
         }
+        # Compact JSON by default; PIPELINE_PRETTY=1 restores indented reports
+        self.pretty = os.environ.get("PIPELINE_PRETTY", "0") == "1"
         
     def run(self):
         print("="*80)
@@ -91,15 +250,13 @@ class FieldAnalysisPipeline:
             url = url_xbrl.replace('##########', cik_padded)
             
             try:
-                # Mock progress for existing files if we want to skip re-fetching
-                # But for this pipeline, we'll implement the actual fetch logic
-                res = reqsesh.get(url)
-                if res.status_code != 200:
-                    print(f"  [{i}/{len(tickers)}] {ticker}: Failed (HTTP {res.status_code})")
+                raw = fetch_companyfacts_cached(reqsesh, url, cik_padded, self.xbrl_cache_dir)
+                if raw is None:
+                    print(f"  [{i}/{len(tickers)}] {ticker}: Failed to fetch companyfacts")
                     failed_tickers.append(ticker)
                     continue
                     
-                data = res.json()
+                data = _json_loads(raw)
                 facts = data.get("facts", {})
                 
                 if not facts:
@@ -109,16 +266,22 @@ class FieldAnalysisPipeline:
 
                 field_count = 0
                 for taxonomy, fields_dict in facts.items():
+                    # Only a handful of taxonomies exist; share one str object per value
+                    taxonomy = sys.intern(taxonomy)
                     for field_name, field_data in fields_dict.items():
                         field_count += 1
                         
                         if field_name not in field_catalog:
+                            label = field_data.get("label") or ""
+                            description = field_data.get("description") or ""
                             field_catalog[field_name] = {
                                 "taxonomy": taxonomy,
                                 "label": field_data.get("label", ""),
                                 "description": field_data.get("description", ""),
                                 "count": 0,
-                                "companies_using": []
+                                "companies_using": [],
+                                # Lowercased search text for Phase 2 (not serialized)
+                                "_text": f"{field_name.lower()} {label.lower()} {description.lower()}"
                             }
                         
                         if ticker not in field_catalog[field_name]["companies_using"]:
@@ -134,8 +297,10 @@ class FieldAnalysisPipeline:
                 failed_tickers.append(ticker)
 
         # Save catalog
-        with open(self.output_files["catalog"], 'w') as f:
-            json.dump(field_catalog, f, indent=2)
+        self._dump(
+            {name: {k: v for k, v in info.items() if k != "_text"} for name, info in field_catalog.items()},
+            self.output_files["catalog"]
+        )
             
         # Save simple list
         with open(self.output_files["output_txt"], 'w') as f:
@@ -149,36 +314,78 @@ class FieldAnalysisPipeline:
             "total_fields": len(field_catalog),
             "total_companies": len(successful_tickers)
         }
-        with open(self.output_files["metadata"], 'w') as f:
-            json.dump(metadata, f, indent=2)
+        self._dump(metadata, self.output_files["metadata"])
             
         print(f"✓ Catalog built: {len(field_catalog)} unique fields from {len(successful_tickers)} companies")
         return field_catalog, metadata
 
+    def _dump(self, obj, path):
+        """Write a JSON report, indented only when self.pretty is set"""
+        if self.pretty:
+            payload = json.dumps(obj, indent=2)
+        else:
+            payload = json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+        Path(path).write_bytes(payload.encode())
+
+    def _write_availability_parquet(self, field_analysis):
+        """Write field_analysis as a columnar Parquet table (one row per field)"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("Warning: pyarrow not installed. Skipping field_analysis.parquet.")
+            return
+
+        schema = pa.schema([
+            ("field_name", pa.string()),
+            ("availability_count", pa.int64()),
+            ("availability_percentage", pa.float64()),
+            ("availability_tier", pa.dictionary(pa.int8(), pa.string())),
+            ("companies_using", pa.list_(pa.string())),
+            ("sector_distribution", pa.map_(pa.string(), pa.int64())),
+            ("is_sector_specific", pa.bool_()),
+            ("dominant_sector", pa.string()),
+            ("statement_type", pa.dictionary(pa.int8(), pa.string())),
+            ("temporal_nature", pa.dictionary(pa.int8(), pa.string())),
+            ("is_critical", pa.bool_()),
+            ("accounting_concept", pa.list_(pa.string())),
+            ("taxonomy", pa.dictionary(pa.int8(), pa.string())),
+            ("label", pa.string()),
+        ])
+        rows = [
+            {**info, "field_name": name, "sector_distribution": list(info["sector_distribution"].items())}
+            for name, info in field_analysis.items()
+        ]
+        table = pa.Table.from_pylist(rows, schema=schema)
+        pq.write_table(table, self.output_files["availability_parquet"], compression="zstd")
+
     def categorize_fields(self, field_catalog):
         """Phase 2: Categorize fields"""
         field_categories = {}
         
         for field_name, field_info in field_catalog.items():
-            label = (field_info.get("label") or "").lower()
-            description = (field_info.get("description") or "").lower()
+            # Pre-lowered at ingest; rebuild for catalogs loaded from disk
+            text = field_info.pop("_text", None)
+            if text is None:
+                label = (field_info.get("label") or "").lower()
+                description = (field_info.get("description") or "").lower()
+                text = f"{field_name.lower()} {label} {description}"
             
             category = {
                 "field_name": field_name,
                 "label": field_info.get("label", ""),
                 "taxonomy": field_info.get("taxonomy", ""),
-                "statement_type": self._categorize_statement_type(field_name, label, description),
-                "temporal_nature": self._categorize_temporal_nature(field_name, label, description),
-                "accounting_concept": self._categorize_accounting_concept(field_name, label, description),
+                "statement_type": self._categorize_statement_type(text),
+                "temporal_nature": self._categorize_temporal_nature(text),
+                "accounting_concept": self._categorize_accounting_concept(text),
                 "is_critical": self._is_critical_field(field_name),
-                "special_handling": self._identify_special_handling(field_name, label, description),
+                "special_handling": self._identify_special_handling(field_name, text),
                 "companies_using": field_info.get("companies_using", []),
                 "count": field_info.get("count", 0)
             }
             field_categories[field_name] = category
         
-        with open(self.output_files["categories"], 'w') as f:
-            json.dump(field_categories, f, indent=2)
+        self._dump(field_categories, self.output_files["categories"])
             
         print(f"✓ Categorized {len(field_categories)} fields")
         return field_categories
@@ -188,10 +395,9 @@ class FieldAnalysisPipeline:
         total_companies = metadata["total_companies"]
         
         # Load sector mapping from enrichment data
-        company_metadata_path = os.path.join(self.root_dir, "config", "company_metadata.json")
         ticker_to_sector = {}
         try:
-            with open(company_metadata_path, 'r') as f:
+            with open(self.company_metadata_path, 'r') as f:
                 company_metadata = json.load(f)
             for ticker, meta in company_metadata.items():
                 ticker_to_sector[ticker] = meta.get("sector", "Unknown")
@@ -205,13 +411,7 @@ class FieldAnalysisPipeline:
             count = field_info["count"]
             availability_pct = (count / total_companies) * 100
             
-            # Determine tier
-            if availability_pct >= 90: tier = "universal"
-            elif availability_pct >= 70: tier = "very_common"
-            elif availability_pct >= 50: tier = "common"
-            elif availability_pct >= 30: tier = "moderate"
-            elif availability_pct >= 10: tier = "rare"
-            else: tier = "very_rare"
+            tier = _availability_tier(availability_pct)
             
             availability_tiers[tier].append(field_name)
             
@@ -250,15 +450,33 @@ class FieldAnalysisPipeline:
             "total_companies_analyzed": total_companies,
             "total_unique_fields": len(field_catalog),
             "availability_tiers": {
-                k: {"count": len(v), "percentage": round(len(v)/len(field_catalog)*100, 1)} 
+                k: {
+                    "count": len(v),
+                    "percentage": round(len(v)/len(field_catalog)*100, 1),
+                    "description": TIER_DESCRIPTIONS[k]
+                }
                 for k, v in availability_tiers.items()
             },
-            "sector_specific_fields": sum(1 for f in field_analysis.values() if f["is_sector_specific"])
+            "sector_specific_fields": sum(1 for f in field_analysis.values() if f["is_sector_specific"]),
+            "critical_universal_fields": [
+                name for name, f in field_analysis.items()
+                if f["is_critical"] and f["availability_tier"] in ["universal", "very_common"]
+            ]
         }
         
+        sector_specific_breakdown = defaultdict(list)
+        for name, f in field_analysis.items():
+            if f["is_sector_specific"]:
+                sector_specific_breakdown[f["dominant_sector"]].append({
+                    "field": name,
+                    "label": f["label"],
+                    "count": f["availability_count"]
+                })
+        summary["sector_specific_breakdown"] = dict(sector_specific_breakdown)
+        
         output = {"summary": summary, "field_analysis": field_analysis}
-        with open(self.output_files["availability"], 'w') as f:
-            json.dump(output, f, indent=2)
+        self._dump(output, self.output_files["availability"])
+        self._write_availability_parquet(field_analysis)
             
         print(f"✓ analyzed availability: {len(availability_tiers['universal'])} universal fields, {len(availability_tiers['very_common'])} very common")
         return output
@@ -296,7 +514,8 @@ class FieldAnalysisPipeline:
                 "tier": analysis.get("availability_tier", "")
             }
             
-        sorted_priority = dict(sorted(priority_map.items(), key=lambda x: -x[1]["priority_score"]))
+        # reverse=True keeps ties in catalog order, same as sorting on the negated score
+        sorted_priority = dict(sorted(priority_map.items(), key=_priority_score, reverse=True))
         
         rules = {
             "deprecated_fields": deprecated,
@@ -304,45 +523,30 @@ class FieldAnalysisPipeline:
             "consolidation_recommendations": self._create_consolidation_rules(similar_groups, sorted_priority)
         }
         
-        with open(self.output_files["mapping"], 'w') as f:
-            json.dump(rules, f, indent=2)
+        self._dump(rules, self.output_files["mapping"])
             
-        with open(self.output_files["priority"], 'w') as f:
-            json.dump(sorted_priority, f, indent=2)
+        self._dump(sorted_priority, self.output_files["priority"])
             
         print(f"✓ Standardization complete: {len(similar_groups)} similar field groups identified")
 
     # --- Helper Methods ---
     
-    def _categorize_statement_type(self, field_name, label, description):
-        text = f"{field_name.lower()} {label} {description}"
-        if any(x in text for x in ['cash flow', 'operating activities']): return "Cash Flow Statement"
-        if any(x in text for x in ['revenue', 'income', 'expense', 'profit', 'loss']) and not any(x in text for x in ['deferred', 'payable', 'receivable']): return "Income Statement"
-        if any(x in text for x in ['equity', 'stock', 'shares']): return "Balance Sheet - Equity"
-        if 'asset' in text: return "Balance Sheet - Assets"
-        if 'liability' in text or 'payable' in text: return "Balance Sheet - Liabilities"
-        if any(x in text for x in ['balance sheet', 'inventory', 'debt']): return "Balance Sheet"
-        if 'entity' in text or 'document' in text: return "Document & Entity Information"
-        return "Other/Footnotes"
-
-    def _categorize_temporal_nature(self, field_name, label, description):
-        text = f"{field_name.lower()} {label} {description}"
-        period_keys = ['during', 'for the period', 'revenue', 'expense', 'income', 'flow', 'increase', 'decrease']
-        if any(x in text for x in period_keys): return "Period"
+    def _categorize_statement_type(self, text):
+        if _CASH_FLOW_RE.search(text): return STMT_CASH_FLOW
+        if _INCOME_RE.search(text) and not _NOT_INCOME_RE.search(text): return STMT_INCOME
+        if _EQUITY_RE.search(text): return STMT_EQUITY
+        if 'asset' in text: return STMT_ASSETS
+        if _LIABILITY_RE.search(text): return STMT_LIABILITIES
+        if _BALANCE_SHEET_RE.search(text): return STMT_BALANCE_SHEET
+        if _DEI_RE.search(text): return STMT_DEI
+        return STMT_OTHER
+
+    def _categorize_temporal_nature(self, text):
+        if _PERIOD_RE.search(text): return "Period"
         return "Point-in-Time"
 
-    def _categorize_accounting_concept(self, field_name, label, description):
-        text = f"{field_name.lower()} {label} {description}"
-        concepts = []
-        if any(x in text for x in ['revenue', 'sales']): concepts.append("Revenue")
-        if any(x in text for x in ['expense', 'cost']): concepts.append("Expense")
-        if any(x in text for x in ['asset', 'receivable', 'inventory']): concepts.append("Asset")
-        if any(x in text for x in ['liability', 'payable', 'debt']): concepts.append("Liability")
-        if any(x in text for x in ['equity', 'stock', 'capital']): concepts.append("Equity")
-        if any(x in text for x in ['cash']): concepts.append("Cash")
-        if any(x in text for x in ['tax']): concepts.append("Tax")
-        if any(x in text for x in ['share-based']): concepts.append("Share-Based Compensation")
-        if any(x in text for x in ['earnings per share', 'eps']): concepts.append("Earnings Per Share")
+    def _categorize_accounting_concept(self, text):
+        concepts = [concept for pattern, concept in _CONCEPT_RES if pattern.search(text)]
         return concepts if concepts else ["Other"]
 
     def _is_critical_field(self, field_name):
@@ -355,8 +559,7 @@ class FieldAnalysisPipeline:
         ]
         return any(re.search(p, field_name, re.IGNORECASE) for p in critical)
 
-    def _identify_special_handling(self, field_name, label, description):
-        text = f"{field_name.lower()} {label} {description}"
+    def _identify_special_handling(self, field_name, text):
         special = []
         if 'per share' in text or 'pershare' in field_name.lower(): special.append("Per-Share Metric")
         if 'ratio' in text or 'rate' in text: special.append("Ratio/Rate")
@@ -375,19 +578,46 @@ class FieldAnalysisPipeline:
         ]
         
         groups = []
+        trigram_index = None
         for name, fields in patterns:
+            found = [f for f in fields if f in field_catalog]
+            # Curated list is the fast path; fall back to fuzzy lookup when it comes up short
+            if len(found) < 2:
+                if trigram_index is None:
+                    trigram_index = _build_trigram_index(field_catalog.keys())
+                for f in self._find_similar(fields[0], trigram_index):
+                    if f not in found:
+                        found.append(f)
+
             matches = []
-            for f in fields:
-                if f in field_catalog:
-                    matches.append({
-                        "field_name": f,
-                        "label": field_catalog[f].get("label", ""),
-                        "availability": field_analysis.get(f, {}).get("availability_percentage", 0)
-                    })
+            for f in found:
+                matches.append({
+                    "field_name": f,
+                    "label": field_catalog[f].get("label", ""),
+                    "availability": field_analysis.get(f, {}).get("availability_percentage", 0)
+                })
             if len(matches) > 1:
                 groups.append({"concept": name, "fields": matches})
         return groups
 
+    def _find_similar(self, query, trigram_index):
+        """Field names sharing enough trigrams with query, ranked by Jaccard similarity"""
+        query_grams = _trigrams(query)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for name in trigram_index.get(gram, ()):
+                shared[name] += 1
+
+        ranked = []
+        for name, n_shared in shared.items():
+            if n_shared < SIMILAR_MIN_SHARED_TRIGRAMS:
+                continue
+            jaccard = n_shared / len(query_grams | _trigrams(name))
+            if jaccard >= SIMILAR_MIN_JACCARD:
+                ranked.append((jaccard, name))
+        ranked.sort(key=lambda x: -x[0])
+        return [name for _, name in ranked]
+
     def _create_consolidation_rules(self, groups, priority_map):
         rules = []
         for group in groups:
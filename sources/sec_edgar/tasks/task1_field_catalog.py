@@ -99,6 +99,7 @@ def build_expanded_field_catalog():
             field_count = 0
             # Process each taxonomy
             for taxonomy, fields_dict in facts.items():
+                taxonomy = sys.intern(taxonomy)
                 for field_name, field_data in fields_dict.items():
                     field_count += 1
                     
@@ -31,9 +31,10 @@ class PointInTimeMapper:
     def __init__(self):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.root_dir = str(Path(self.base_dir).parent.parent.parent)
-        self.config_path = os.path.join(self.root_dir, "config/cik.json")
-        self.fye_path = os.path.join(self.root_dir, "reports/fiscal_year_metadata.json")
-        self.output_path = os.path.join(self.root_dir, "reports/point_in_time_map.json")
+        root = self.root_dir
+        self.config_path = f"{root}/config/cik.json"
+        self.fye_path = f"{root}/reports/fiscal_year_metadata.json"
+        self.output_path = f"{root}/reports/point_in_time_map.json"
         self.reqsesh = RequestSession()
         
     def run(self):
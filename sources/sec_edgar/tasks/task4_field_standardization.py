@@ -1,9 +1,36 @@
-import json
 import os
 from pathlib import Path
 from collections import defaultdict
 import re
-from difflib import SequenceMatcher
+import sys
+from itertools import islice
+
+import numpy as np
+
+# Add modules from base repo
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from sources.sec_edgar.tasks.field_analysis_pipeline import dump_json, load_json
+
+# Deprecation date embedded in XBRL descriptions, e.g. "Deprecated 2019-01-31"
+_DEPRECATED_RE = re.compile(r'Deprecated (\d{4}-\d{2}-\d{2})')
+# Label keywords that indicate a monetary amount
+_MONETARY_RE = re.compile(r'amount|value|expense|income|revenue|assets|liabilities')
+
+try:
+    from rapidfuzz.fuzz import token_sort_ratio as _name_ratio
+except ImportError:
+    from difflib import SequenceMatcher
+
+    def _name_ratio(a, b):
+        """difflib stand-in for rapidfuzz; autojunk=False avoids its popular-character heuristic"""
+        return SequenceMatcher(None, a, b, autojunk=False).ratio() * 100
+
+def _similar(a, b, min_ratio=85):
+    """Fuzzy name match; cheap length check first, then a 0-100 name ratio"""
+    if abs(len(a) - len(b)) > max(len(a), len(b)) * 0.4:
+        return False
+    return _name_ratio(a, b) >= min_ratio
 
 def analyze_field_standardization():
     """
@@ -19,24 +46,25 @@ def analyze_field_standardization():
     """
     base_dir = os.path.dirname(os.path.abspath(__file__))
     root_dir = str(Path(base_dir).parent.parent.parent)
-    catalog_path = os.path.join(root_dir, "reports/field_catalog.json")
-    categories_path = os.path.join(root_dir, "reports/field_categories.json")
-    availability_path = os.path.join(root_dir, "reports/field_availability_report.json")
+    catalog_path = f"{root_dir}/reports/field_catalog.json"
+    categories_path = f"{root_dir}/reports/field_categories.json"
+    availability_path = f"{root_dir}/reports/field_availability_report.json"
     
     # Load data
-    with open(catalog_path, 'r') as f:
-        field_catalog = json.load(f)
-    
-    with open(categories_path, 'r') as f:
-        field_categories = json.load(f)
+    field_catalog = load_json(catalog_path)
+    field_categories = load_json(categories_path)
+    availability_report = load_json(availability_path)
     
-    with open(availability_path, 'r') as f:
-        availability_report = json.load(f)
+    # Only a handful of distinct taxonomies; intern them so the many
+    # "us-gaap"/"ifrs-full" comparisons below short-circuit on identity
+    for field_info in field_catalog.values():
+        field_info["taxonomy"] = sys.intern(field_info.get("taxonomy") or "")
     
     print(f"Analyzing field standardization for {len(field_catalog)} fields...\n")
     
     # 1. Identify deprecated fields
     deprecated_fields = identify_deprecated_fields(field_catalog)
+    deprecated_names = frozenset(f["field_name"] for f in deprecated_fields)
     
     # 2. Find similar field names (potential synonyms)
     similar_fields = find_similar_fields(field_catalog, field_categories, availability_report)
@@ -45,7 +73,7 @@ def analyze_field_standardization():
     gaap_ifrs_mappings = identify_gaap_ifrs_mappings(field_catalog, field_categories)
     
     # 4. Create priority mapping (which field to prefer when multiple options exist)
-    field_priority = create_field_priority(field_catalog, availability_report, deprecated_fields)
+    field_priority = create_field_priority(field_catalog, availability_report, deprecated_names)
     
     # 5. Identify unit types
     unit_classifications = classify_field_units(field_catalog, field_categories)
@@ -60,14 +88,11 @@ def analyze_field_standardization():
     }
     
     # Save outputs
-    mapping_path = os.path.join(root_dir, "reports/field_mapping.json")
-    priority_path = os.path.join(root_dir, "reports/field_priority.json")
+    mapping_path = f"{root_dir}/reports/field_mapping.json"
+    priority_path = f"{root_dir}/reports/field_priority.json"
     
-    with open(mapping_path, 'w') as f:
-        json.dump(standardization_rules, f, indent=2)
-    
-    with open(priority_path, 'w') as f:
-        json.dump(field_priority, f, indent=2)
+    dump_json(standardization_rules, mapping_path)
+    dump_json(field_priority, priority_path)
     
     # Print summary
     print_summary(standardization_rules, field_priority)
@@ -80,13 +105,13 @@ def identify_deprecated_fields(field_catalog):
     deprecated = []
     
     for field_name, field_info in field_catalog.items():
-        label = field_info.get("label", "")
-        description = field_info.get("description", "")
+        label = field_info.get("label") or ""
+        description = field_info.get("description") or ""
         
         # Check for deprecation markers
         if "deprecated" in label.lower() or "deprecated" in description.lower():
             # Extract deprecation date if available
-            deprecation_match = re.search(r'Deprecated (\d{4}-\d{2}-\d{2})', description)
+            deprecation_match = _DEPRECATED_RE.search(description)
             deprecation_date = deprecation_match.group(1) if deprecation_match else None
             
             deprecated.append({
@@ -151,8 +176,58 @@ def find_similar_fields(field_catalog, field_categories, availability_report):
                 "recommendation": "Choose highest availability field as standard"
             })
     
+    # Fuzzy discovery among remaining high-value fields. Only names sharing a
+    # 6-character prefix are compared, so cost is sum(|bucket|^2) rather than n^2.
+    grouped = {f["field_name"] for group in similar_groups for f in group["fields"]}
+    buckets = defaultdict(list)
+    for field in high_value_fields:
+        if field in field_catalog and field not in grouped:
+            buckets[field[:6].lower()].append(field)
+    
+    for prefix, bucket in sorted(buckets.items()):
+        for cluster in _cluster_similar_names(bucket):
+            similar_groups.append({
+                "concept": f"{prefix}*",
+                "fields": [
+                    {
+                        "field_name": field,
+                        "label": field_catalog[field].get("label", ""),
+                        "availability": field_analysis.get(field, {}).get("availability_percentage", 0),
+                        "companies_using": field_catalog[field].get("companies_using", []),
+                        "taxonomy": field_catalog[field].get("taxonomy", "")
+                    }
+                    for field in cluster
+                ],
+                "recommendation": "Fuzzy name match; review before consolidating",
+                "needs_review": True
+            })
+    
     return similar_groups
 
+def _cluster_similar_names(names):
+    """Group names connected by _similar() pairs; returns clusters of 2+ names"""
+    # Sorted by length so the inner loop can stop once lengths diverge too far
+    names = sorted(names, key=len)
+    parent = {name: name for name in names}
+    
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+    
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            if len(b) - len(a) > len(b) * 0.4:
+                break
+            if _similar(a, b):
+                parent[find(a)] = find(b)
+    
+    clusters = defaultdict(list)
+    for name in names:
+        clusters[find(name)].append(name)
+    return [sorted(c) for c in clusters.values() if len(c) > 1]
+
 def identify_gaap_ifrs_mappings(field_catalog, field_categories):
     """Identify equivalent fields between US-GAAP and IFRS"""
     gaap_fields = {}
@@ -188,54 +263,52 @@ def identify_gaap_ifrs_mappings(field_catalog, field_categories):
     
     return mappings
 
-def create_field_priority(field_catalog, availability_report, deprecated_fields):
-    """Create priority ranking for fields"""
+def create_field_priority(field_catalog, availability_report, deprecated_names):
+    """Create priority ranking for fields; deprecated_names is a set of field names"""
     field_analysis = availability_report["field_analysis"]
-    deprecated_names = {f["field_name"] for f in deprecated_fields}
     
-    priority_map = {}
+    # One column per scoring input, aligned with catalog order
+    names = list(field_catalog)
+    analyses = [field_analysis.get(name, {}) for name in names]
+    n = len(names)
+    availability = np.fromiter((a.get("availability_percentage", 0) for a in analyses), dtype=np.float64, count=n)
+    is_critical = np.fromiter((a.get("is_critical", False) for a in analyses), dtype=bool, count=n)
+    tiers = np.array([a.get("availability_tier", "") for a in analyses], dtype=object)
+    is_deprecated = np.fromiter((name in deprecated_names for name in names), dtype=bool, count=n)
+    is_gaap = np.fromiter((field_catalog[name].get("taxonomy") == "us-gaap" for name in names), dtype=bool, count=n)
+    
+    # Calculate priority score:
+    #   availability (0-100) + critical (50) + universal/very common tier (25/15)
+    #   - deprecated (100) + US-GAAP preference (5)
+    score = availability + 50 * is_critical
+    score = score + np.where(tiers == "universal", 25, np.where(tiers == "very_common", 15, 0))
+    score = score - 100 * is_deprecated
+    score = score + 5 * is_gaap
+    
+    # Round with Python's round() per field, as the report always has: np.round can
+    # differ on .x5 ties, and fields without a float availability keep an int score
+    scores = [
+        round(value, 1) if isinstance(a.get("availability_percentage", 0), float) else int(value)
+        for value, a in zip(score.tolist(), analyses)
+    ]
     
-    for field_name, field_info in field_catalog.items():
-        analysis = field_analysis.get(field_name, {})
-        
-        # Calculate priority score
-        score = 0
-        
-        # Availability (0-100 points)
-        score += analysis.get("availability_percentage", 0)
-        
-        # Critical field bonus (50 points)
-        if analysis.get("is_critical", False):
-            score += 50
-        
-        # Universal/very common tier bonus (25 points)
-        tier = analysis.get("availability_tier", "")
-        if tier == "universal":
-            score += 25
-        elif tier == "very_common":
-            score += 15
-        
-        # Deprecated penalty (-100 points)
-        if field_name in deprecated_names:
-            score -= 100
-        
-        # US-GAAP preference (slight bonus, 5 points)
-        if field_info.get("taxonomy") == "us-gaap":
-            score += 5
-        
-        priority_map[field_name] = {
-            "priority_score": round(score, 1),
+    # Sort by priority score (stable, so ties keep catalog order)
+    order = np.argsort(-np.array(scores, dtype=np.float64), kind="stable")
+    
+    sorted_priority = {}
+    for i in order.tolist():
+        name = names[i]
+        analysis = analyses[i]
+        sorted_priority[name] = {
+            "priority_score": scores[i],
             "availability_percentage": analysis.get("availability_percentage", 0),
             "is_critical": analysis.get("is_critical", False),
-            "tier": tier,
-            "is_deprecated": field_name in deprecated_names,
-            "taxonomy": field_info.get("taxonomy", ""),
-            "label": field_info.get("label", "")
+            "tier": analysis.get("availability_tier", ""),
+            "is_deprecated": bool(is_deprecated[i]),
+            "taxonomy": field_catalog[name].get("taxonomy", ""),
+            "label": field_catalog[name].get("label", "")
         }
     
-    # Sort by priority score
-    sorted_priority = dict(sorted(priority_map.items(), key=lambda x: -x[1]["priority_score"]))
-    
     return sorted_priority
 
 def classify_field_units(field_catalog, field_categories):
@@ -250,9 +323,7 @@ def classify_field_units(field_catalog, field_categories):
     }
     
     for field_name, field_info in field_catalog.items():
-        label = field_info.get("label", "").lower()
-        description = field_info.get("description", "").lower()
-        category = field_categories.get(field_name, {})
+        label = (field_info.get("label") or "").lower()
         
         # Classify based on patterns
         if "per share" in label or "pershare" in field_name.lower():
@@ -261,7 +332,7 @@ def classify_field_units(field_catalog, field_categories):
             unit_types["shares"].append(field_name)
         elif "percent" in label or "rate" in label or "ratio" in label:
             unit_types["percentage"].append(field_name)
-        elif any(x in label for x in ["amount", "value", "expense", "income", "revenue", "assets", "liabilities"]):
+        elif _MONETARY_RE.search(label):
             unit_types["monetary"].append(field_name)
         else:
             unit_types["other"].append(field_name)
@@ -276,10 +347,17 @@ def classify_field_units(field_catalog, field_categories):
     }
 
 def create_consolidation_rules(similar_groups, field_priority):
-    """Create rules for consolidating similar fields"""
+    """
+    Create rules for consolidating similar fields. Fuzzy name-match groups are
+    skipped: similar names can still mean different things (LiabilitiesCurrent
+    vs LiabilitiesNoncurrent), so they are left in similar_field_groups for review.
+    """
     rules = []
     
     for group in similar_groups:
+        if group.get("needs_review"):
+            continue
+        
         # Find the highest priority field in the group
         fields_with_priority = []
         for field_info in group["fields"]:
@@ -313,47 +391,52 @@ def create_consolidation_rules(similar_groups, field_priority):
     return rules
 
 def print_summary(standardization_rules, field_priority):
-    print("="*70)
-    print("FIELD STANDARDIZATION ANALYSIS SUMMARY")
-    print("="*70)
+    # Collect every line and write the summary once instead of print() per line
+    lines = []
+    add = lines.append
+    add("="*70)
+    add("FIELD STANDARDIZATION ANALYSIS SUMMARY")
+    add("="*70)
     
     # Deprecated fields
     deprecated = standardization_rules["deprecated_fields"]
-    print(f"\nDeprecated Fields: {len(deprecated)}")
+    add(f"\nDeprecated Fields: {len(deprecated)}")
     if deprecated:
-        print(f"  Examples:")
+        add(f"  Examples:")
         for field in deprecated[:5]:
-            print(f"    • {field['field_name']} (deprecated {field['deprecation_date'] or 'unknown date'})")
+            add(f"    • {field['field_name']} (deprecated {field['deprecation_date'] or 'unknown date'})")
     
     # Similar field groups
     similar = standardization_rules["similar_field_groups"]
-    print(f"\nSimilar Field Groups: {len(similar)}")
+    add(f"\nSimilar Field Groups: {len(similar)}")
     for group in similar:
-        print(f"\n  {group['concept']}:")
+        add(f"\n  {group['concept']}:")
         for field in group['fields']:
-            print(f"    • {field['field_name']} ({field['availability']}% availability)")
+            add(f"    • {field['field_name']} ({field['availability']}% availability)")
     
     # GAAP/IFRS mappings
     mappings = standardization_rules["gaap_ifrs_mappings"]
-    print(f"\nGAAP/IFRS Mappings: {len(mappings)}")
+    add(f"\nGAAP/IFRS Mappings: {len(mappings)}")
     for mapping in mappings[:5]:
-        print(f"  • {mapping['us_gaap_field']} (US-GAAP) ↔ {mapping['ifrs_field']} (IFRS)")
+        add(f"  • {mapping['us_gaap_field']} (US-GAAP) ↔ {mapping['ifrs_field']} (IFRS)")
     
     # Unit classifications
     units = standardization_rules["unit_classifications"]
-    print(f"\nUnit Classifications:")
+    add(f"\nUnit Classifications:")
     for unit_type, info in units.items():
-        print(f"  {unit_type}: {info['count']} fields")
+        add(f"  {unit_type}: {info['count']} fields")
     
     # Top priority fields
-    print(f"\nTop 15 Priority Fields (for standardization):")
-    top_fields = list(field_priority.items())[:15]
-    for field_name, info in top_fields:
-        print(f"  • {field_name} (score: {info['priority_score']}, {info['availability_percentage']}% avail)")
+    add(f"\nTop 15 Priority Fields (for standardization):")
+    # field_priority is already ordered by score; take the head without copying it
+    for field_name, info in islice(field_priority.items(), 15):
+        add(f"  • {field_name} (score: {info['priority_score']}, {info['availability_percentage']}% avail)")
     
     # Consolidation rules
     consolidation = standardization_rules["consolidation_recommendations"]
-    print(f"\nConsolidation Rules: {len(consolidation)}")
+    add(f"\nConsolidation Rules: {len(consolidation)}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     analyze_field_standardization()
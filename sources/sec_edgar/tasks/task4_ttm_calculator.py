@@ -1,14 +1,52 @@
+import hashlib
 import json
 import os
+import pickle
 import sys
+import time
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from operator import itemgetter
 
 # Add modules from base repo
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
-from utils.session import RequestSession
+from utils.session import RequestSession, RateLimiter
+from sources.sec_edgar.tasks.field_analysis_pipeline import (
+    XBRL_CACHE_TTL_SECONDS, dump_json, fetch_companyfacts_cached, load_json, write_bytes_atomic,
+)
+
+# XBRL fields that feed each TTM concept, in order of preference
+TTM_CONCEPT_FIELDS = {
+    'Revenue': ['us-gaap:Revenues', 'us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax', 'ifrs-full:Revenue'],
+    'NetIncome': ['us-gaap:NetIncomeLoss', 'us-gaap:ProfitLoss', 'ifrs-full:ProfitLoss'],
+}
+
+# Tickers processed concurrently; SEC allows at most 10 requests per second
+TTM_MAX_WORKERS = 8
+SEC_MAX_REQUESTS_PER_SECOND = 10
+
+# Payloads larger than this are streamed with ijson (when installed) instead of
+# being parsed whole; only the TTM_CONCEPT_FIELDS subtrees are materialized
+STREAM_PARSE_MIN_BYTES = 32 * 1024 * 1024
+
+# Value-map pickles are keyed by the fields they were built from, so editing
+# TTM_CONCEPT_FIELDS leaves stale pickles unread
+VALUE_MAP_CACHE_KEY = hashlib.blake2b(
+    json.dumps(TTM_CONCEPT_FIELDS, sort_keys=True).encode(), digest_size=8
+).hexdigest()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 class TrailingMetricsCalculator:
     """
@@ -33,106 +71,192 @@ class TrailingMetricsCalculator:
     def __init__(self):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.root_dir = str(Path(self.base_dir).parent.parent.parent)
-        self.config_path = os.path.join(self.root_dir, "config/cik.json")
-        self.pit_path = os.path.join(self.root_dir, "reports/point_in_time_map.json")
-        self.output_path = os.path.join(self.root_dir, "reports/ttm_metrics.json")
+        root = self.root_dir
+        self.config_path = f"{root}/config/cik.json"
+        self.pit_path = f"{root}/reports/point_in_time_map.json"
+        self.output_path = f"{root}/reports/ttm_metrics.json"
+        self.cache_dir = f"{root}/cache/xbrl"
         self.reqsesh = RequestSession()
+        self.rate_limiter = RateLimiter(SEC_MAX_REQUESTS_PER_SECOND)
         
     def run(self):
-        with open(self.pit_path, 'r') as f:
-            pit_map = json.load(f)
-            
-        with open(self.config_path, 'r') as f:
-            cik_map = json.load(f)
+        pit_map = load_json(self.pit_path)
+        cik_map = load_json(self.config_path)
             
         print(f"Calculating TTM metrics for {len(pit_map)} companies...")
         
-        ttm_results = {}
+        results = {}
         
-        for i, (ticker, timeline) in enumerate(pit_map.items(), 1):
-            print(f"[{i}/{len(pit_map)}] Processing {ticker}...")
-            
-            # We need the actual data to calculate values
-            cik = cik_map[ticker].zfill(10)
-            url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-            
-            try:
-                res = self.reqsesh.get(url)
-                if res.status_code != 200: continue
-                data = res.json()
-                facts = data.get("facts", {})
+        # Tickers are independent; overlap network waits across a small worker pool
+        with ThreadPoolExecutor(max_workers=TTM_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self._process_ticker, ticker, timeline, cik_map): ticker
+                for ticker, timeline in pit_map.items()
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                ticker = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[{i}/{len(pit_map)}] {ticker}: Error: {e}")
+                    continue
                 
-                # Calculate TTM for Revenue and Net Income
-                revenue = self.calculate_ttm_series(ticker, timeline, facts, 'Revenue')
-                net_income = self.calculate_ttm_series(ticker, timeline, facts, 'NetIncome')
+                if result is None:
+                    print(f"[{i}/{len(pit_map)}] {ticker}: Failed to fetch companyfacts")
+                    continue
                 
-                ttm_results[ticker] = {
-                    "Revenue_TTM": revenue,
-                    "NetIncome_TTM": net_income
-                }
-                
-                print(f"  ✓ Calculated {len(revenue)} TTM points")
-                
-            except Exception as e:
-                print(f"  Error: {e}")
+                results[ticker] = result
+                print(f"[{i}/{len(pit_map)}] {ticker}: ✓ Calculated {len(result['Revenue_TTM'])} TTM points")
+        
+        # Keep output in point-in-time map order regardless of completion order
+        ttm_results = {ticker: results[ticker] for ticker in pit_map if ticker in results}
                 
         # Save results
-        with open(self.output_path, 'w') as f:
-            json.dump(ttm_results, f, indent=2)
+        dump_json(ttm_results, self.output_path)
             
         print(f"\n✓ TTM Metrics saved to {self.output_path}")
 
-    def calculate_ttm_series(self, ticker, timeline, facts, concept_type):
+    def _process_ticker(self, ticker, timeline, cik_map):
+        """Compute the TTM series for one ticker, or None if its data can't be fetched"""
+        # We need the actual data to calculate values
+        cik = cik_map[ticker].zfill(10)
+        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+        
+        value_maps = self._load_value_maps(cik, url)
+        if value_maps is None:
+            return None
+        
+        # Sort timeline by filing date once for both concepts
+        sorted_events = sorted(timeline, key=itemgetter('filing_date'))
+        
+        # Calculate TTM for Revenue and Net Income in a single pass
+        series = self.calculate_ttm_series(ticker, sorted_events, value_maps)
+        return {f"{concept}_TTM": series[concept] for concept in TTM_CONCEPT_FIELDS}
+
+    def _load_value_maps(self, cik, url):
+        """
+        Per-concept value maps for one company. Both the raw companyfacts payload and
+        the parsed value maps are cached under cache/xbrl/ for XBRL_CACHE_TTL_SECONDS;
+        an unreadable pickle is treated as a miss and rebuilt.
+        """
+        pkl_path = f"{self.cache_dir}/{cik}.value_map.{VALUE_MAP_CACHE_KEY}.pkl"
+        if os.path.exists(pkl_path) and time.time() - os.path.getmtime(pkl_path) < XBRL_CACHE_TTL_SECONDS:
+            try:
+                with open(pkl_path, 'rb') as f:
+                    return pickle.load(f)
+            except (pickle.UnpicklingError, EOFError):
+                pass
+        
+        raw = fetch_companyfacts_cached(self.reqsesh, url, cik, self.cache_dir, self.rate_limiter)
+        if raw is None:
+            return None
+        if ijson is not None and len(raw) >= STREAM_PARSE_MIN_BYTES:
+            facts = self._stream_concept_facts(raw)
+        else:
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            facts = data.get("facts", {})
+        
+        # Build every concept's map from a single parse of the payload
+        value_maps = {concept: self.build_value_map(facts, concept) for concept in TTM_CONCEPT_FIELDS}
+        
+        write_bytes_atomic(pkl_path, pickle.dumps(value_maps, protocol=pickle.HIGHEST_PROTOCOL))
+        return value_maps
+
+    def _stream_concept_facts(self, raw):
         """
-        Build a daily/weekly/monthly TTM series. 
-        For efficiency here, we'll calculate TTM at each filing date update.
+        Pull just the units of every TTM_CONCEPT_FIELDS field out of a companyfacts
+        payload with ijson, returning a sparse facts dict of the same shape.
+        The payload is walked once; only the wanted units subtrees are built, and
+        parsing stops as soon as all of them have been seen.
         """
-        # Map concept to fields (using our pipeline's logic implicitly)
-        fields = []
-        if concept_type == 'Revenue':
-            fields = ['us-gaap:Revenues', 'us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax', 'ifrs-full:Revenue']
-        elif concept_type == 'NetIncome':
-            fields = ['us-gaap:NetIncomeLoss', 'us-gaap:ProfitLoss', 'ifrs-full:ProfitLoss']
+        wanted = {}
+        for fields in TTM_CONCEPT_FIELDS.values():
+            for field_key in fields:
+                taxonomy, field = field_key.split(':')
+                wanted[f"facts.{taxonomy}.{field}.units"] = (taxonomy, field)
+        
+        facts = {}
+        events = ijson.parse(raw, use_float=True)
+        for prefix, event, value in events:
+            if event != 'start_map' or prefix not in wanted:
+                continue
+            
+            # Feed this subtree's events to a builder until its map closes
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+            for _, event, value in events:
+                builder.event(event, value)
+                if event in ('start_map', 'start_array'):
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                    if depth == 0:
+                        break
+            
+            taxonomy, field = wanted.pop(prefix)
+            facts.setdefault(taxonomy, {})[field] = {'units': builder.value}
+            if not wanted:
+                break
+        return facts
+
+    def build_value_map(self, facts, concept_type):
+        """Index a concept's reported values by end_date, then (fp, form)"""
+        fields = TTM_CONCEPT_FIELDS.get(concept_type, [])
             
         # Extract all available values
         values = []
+        extend = values.extend
         for field_key in fields:
             taxonomy, field = field_key.split(':')
             if taxonomy in facts and field in facts[taxonomy]:
                 units = facts[taxonomy][field]['units']
                 for unit_key in units:
-                    values.extend(units[unit_key])
+                    extend(units[unit_key])
         
-        # Index values by (end_date, form) -> value
-        # We need to handle both Q and FY data
+        # Index values by end_date -> {(fp, form): value}
+        # We need to handle both Q and FY data; fp and form are interned (a
+        # handful of distinct values) and the inner dict holds one period's
+        # few filings, so _find_value's form fallback only scans that period
         value_map = {}
+        get_period = value_map.setdefault
+        intern = sys.intern
         for v in values:
-            if 'end' in v and 'val' in v:
-                key = (v['end'], v.get('fp', ''), v.get('form', ''))
-                # Prefer latest filing if duplicates exist (though API usually gives latest)
-                value_map[key] = v['val']
-                
-        ttm_series = []
+            # Prefer latest filing if duplicates exist (though API usually gives latest);
+            # entries without 'end' or 'val' are skipped
+            try:
+                get_period(v['end'], {})[(intern(v.get('fp') or ''), intern(v.get('form') or ''))] = v['val']
+            except KeyError:
+                continue
+        
+        return value_map
+
+    def calculate_ttm_series(self, ticker, sorted_events, value_maps):
+        """
+        Build a daily/weekly/monthly TTM series for every concept in value_maps.
+        For efficiency here, we'll calculate TTM at each filing date update,
+        walking the timeline once and updating all concepts in lockstep.
+        sorted_events must already be ordered by filing_date.
+        """
+        concepts = list(value_maps)
+        ttm_series = {concept: [] for concept in concepts}
         
         # Iterate through timeline to update TTM as new info arrives
         # Simplified TTM logic: Look for latest 10-K or build from 10-Qs
-        
-        # Sort timeline by filing date
-        sorted_events = sorted(timeline, key=lambda x: x['filing_date'])
-        
-        current_ttm = None
+        current_ttm = dict.fromkeys(concepts)
         
         for event in sorted_events:
             filing_date = event['filing_date']
             period_end = event['period_end']
-            form = event['form']
+            form = sys.intern(event['form'])
             fp = event['fp']
             
             # If 10-K (Annual), TTM is just the annual value
             if form in ['10-K', '20-F', '40-F']:
-                val = self._find_value(value_map, period_end, ['FY'], form)
-                if val is not None:
-                    current_ttm = val
+                for concept in concepts:
+                    val = self._find_value(value_maps[concept], period_end, ['FY'], form)
+                    if val is not None:
+                        current_ttm[concept] = val
             
             # If 10-Q, we need complex logic: (Latest Annual) + (Current Interim) - (Prior Interim)
             # For this MVP, we will try to sum the last 4 quarters if available
@@ -141,25 +265,29 @@ class TrailingMetricsCalculator:
                 # This requires a robust quarterly database which we are building on the fly here
                 # For simplicity in this step, we'll mark as "Requires Q-Sum"
                 pass 
-                
-            if current_ttm is not None:
-                ttm_series.append({
-                    "as_of_date": filing_date,
-                    "period_end": period_end,
-                    "ttm_value": current_ttm,
-                    "source_filing": form
-                })
+            
+            for concept in concepts:
+                if current_ttm[concept] is not None:
+                    ttm_series[concept].append({
+                        "as_of_date": filing_date,
+                        "period_end": period_end,
+                        "ttm_value": current_ttm[concept],
+                        "source_filing": form
+                    })
                 
         return ttm_series
 
     def _find_value(self, value_map, end_date, fp_list, form):
+        period = value_map.get(end_date)
+        if not period:
+            return None
         for fp in fp_list:
-            key = (end_date, fp, form)
-            if key in value_map:
-                return value_map[key]
+            key = (fp, form)
+            if key in period:
+                return period[key]
             # Try without exact form match if needed (sometimes re-filings change things)
-            for k, val in value_map.items():
-                if k[0] == end_date and k[1] == fp:
+            for (period_fp, _), val in period.items():
+                if period_fp == fp:
                     return val
         return None
 
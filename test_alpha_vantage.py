@@ -6,14 +6,20 @@ Tests the provider with BGFV (the problematic ticker from Yahoo Finance).
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import requests
+
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from sources.equity.providers.alpha_vantage import AlphaVantageProvider
 from sources.equity.providers.base import RateLimitError, DataNotFoundError, ProviderError
 
+# One pooled session for every request in this script (keep-alive across calls)
+SESSION = requests.Session()
+
 
 def test_alpha_vantage():
     """Test Alpha Vantage provider with BGFV."""
@@ -34,16 +40,28 @@ def test_alpha_vantage():
     print("=" * 60)
     
     try:
-        provider = AlphaVantageProvider(api_key=api_key)
+        provider = AlphaVantageProvider(api_key=api_key, session=SESSION)
         print(f"✓ Provider initialized: {provider.name}")
         print(f"✓ API Key: {api_key[:8]}...")
         print()
         
+        # Submit all four calls at once; the provider's rate limiter still starts them
+        # 12s apart, so only the response waits overlap. Results and errors are
+        # reported below in test order
+        calls = {
+            "prices": (provider.get_historical_prices, ("BGFV",), {"period": "5y"}),
+            "dividends": (provider.get_dividends, ("BGFV",), {}),
+            "splits": (provider.get_splits, ("BGFV",), {}),
+            "info": (provider.get_info, ("BGFV",), {}),
+        }
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = {name: executor.submit(fn, *args, **kwargs) for name, (fn, args, kwargs) in calls.items()}
+        
         # Test 1: Historical prices
         print("Test 1: Historical Prices (5y)")
         print("-" * 60)
         try:
-            prices = provider.get_historical_prices("BGFV", period="5y")
+            prices = futures["prices"].result()
             print(f"✓ Retrieved {len(prices)} price records")
             if prices:
                 latest = prices[0]
@@ -62,7 +80,7 @@ def test_alpha_vantage():
         print("Test 2: Dividend History")
         print("-" * 60)
         try:
-            dividends = provider.get_dividends("BGFV")
+            dividends = futures["dividends"].result()
             print(f"✓ Retrieved {len(dividends)} dividend records")
             if dividends:
                 for div in dividends[:5]:  # Show first 5
@@ -79,7 +97,7 @@ def test_alpha_vantage():
         print("Test 3: Stock Splits")
         print("-" * 60)
         try:
-            splits = provider.get_splits("BGFV")
+            splits = futures["splits"].result()
             print(f"✓ Retrieved {len(splits)} split records")
             if splits:
                 for split in splits:
@@ -96,7 +114,7 @@ def test_alpha_vantage():
         print("Test 4: Company Info")
         print("-" * 60)
         try:
-            info = provider.get_info("BGFV")
+            info = futures["info"].result()
             if info:
                 print(f"✓ Retrieved company info")
                 print(f"  Sector: {info.get('sector', 'N/A')}")
@@ -1,7 +1,10 @@
-import yfinance as yf
-import requests
+# Manual check script (live network): python test_yfinance_ua.py
+# The function is not named test_* so pytest never collects it or imports yfinance.
+
+def check_custom_session(ticker_symbol):
+    import requests
+    import yfinance as yf
 
-def test_custom_session(ticker_symbol):
     print(f"Testing {ticker_symbol} with custom session...")
     
     session = requests.Session()
@@ -18,4 +21,4 @@ def test_custom_session(ticker_symbol):
         print(f"Failed: {e}")
 
 if __name__ == "__main__":
-    test_custom_session("BGFV")
+    check_custom_session("BGFV")
\ No newline at end of file
@@ -1,17 +1,63 @@
 """Shared fixtures for the test suite."""
 
+import json
 import os
+import sqlite3
+import uuid
 import pytest
-from unittest.mock import MagicMock
 
 from database import DatabaseManager
 
 
+class _Resp:
+    """Minimal stand-in for an HTTP response (much cheaper than a MagicMock)."""
+    __slots__ = ("status_code", "_data", "_ok", "content")
+
+    def __init__(self, status_code, data, ok=None):
+        self.status_code = status_code
+        self._data = data
+        self.content = json.dumps(data).encode()
+        self._ok = status_code == 200 if ok is None else ok
+
+    def json(self):
+        return self._data
+
+    def __bool__(self):
+        # truthy when status_code == 200 unless overridden
+        return self._ok
+
+
+@pytest.fixture(scope="session")
+def _schema_template(tmp_path_factory):
+    """SQLite file with the full schema, built once per session (per xdist worker)."""
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    template = str(tmp_path_factory.mktemp(f"schema_{worker_id}") / "template.db")
+    DatabaseManager(db_path=template).close()
+    return template
+
+
+@pytest.fixture
+def memory_db_path(_schema_template):
+    """
+    URI of a fresh shared-cache in-memory DB seeded from the schema template.
+    Every DatabaseManager opened on it sees the same data while one is open.
+    """
+    db_path = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    seed = sqlite3.connect(db_path, uri=True)
+    template = sqlite3.connect(_schema_template)
+    template.backup(seed)
+    template.close()
+    yield db_path
+    seed.close()
+
+
 @pytest.fixture
-def tmp_db(tmp_path):
-    """Fresh DatabaseManager backed by a real SQLite DB in tmp_path."""
-    db_path = str(tmp_path / "test.db")
-    db = DatabaseManager(db_path=db_path)
+def tmp_db(memory_db_path):
+    """Fresh DatabaseManager backed by a shared in-memory SQLite DB."""
+    db = DatabaseManager(db_path=memory_db_path)
+    # Throwaway DB — durability is irrelevant
+    db.conn.execute("PRAGMA synchronous=OFF")
+    db.conn.execute("PRAGMA temp_store=MEMORY")
     yield db
     db.close()
 
@@ -19,38 +65,70 @@ def tmp_db(tmp_path):
 @pytest.fixture
 def mock_response():
     """Factory for mock HTTP responses."""
-    def _make(status_code=200, json_data=None):
-        resp = MagicMock()
-        resp.status_code = status_code
-        resp.json.return_value = json_data or {}
-        # truthy when status_code == 200
-        resp.__bool__ = lambda self: self.status_code == 200
-        return resp
+    def _make(status_code=200, json_data=None, ok=None):
+        return _Resp(status_code, json_data or {}, ok)
     return _make
 
 
+# Base article payload — read-only, the factory below returns merged copies
+_ARTICLE_BASE = {
+    "provider": "test",
+    "source_name": "Test Source",
+    "title": "Test Article Title",
+    "description": "Test description",
+    "url": "https://example.com/article-1",
+    "published_at": "2025-01-15T10:00:00Z",
+    "fetched_at": "2025-01-15T12:00:00Z",
+    "category": "business",
+    "sentiment": 0.5,
+    "topics": ("economy",),
+    "image_url": "https://example.com/img.jpg",
+}
+
+
 @pytest.fixture
 def sample_news_article():
     """Factory fixture — call with overrides to get an article dict."""
     def _make(**overrides):
-        article = {
-            "provider": "test",
-            "source_name": "Test Source",
-            "title": "Test Article Title",
-            "description": "Test description",
-            "url": "https://example.com/article-1",
-            "published_at": "2025-01-15T10:00:00Z",
-            "fetched_at": "2025-01-15T12:00:00Z",
-            "category": "business",
-            "sentiment": 0.5,
-            "topics": ["economy"],
-            "image_url": "https://example.com/img.jpg",
-        }
-        article.update(overrides)
-        return article
+        return {**_ARTICLE_BASE, **overrides}
     return _make
 
 
+@pytest.fixture
+def seed_articles():
+    """
+    Insert article rows directly with one executemany in one transaction.
+    For tests that only need rows to exist (no topics, no upsert bookkeeping).
+    """
+    sql = """
+        INSERT OR IGNORE INTO news_articles
+            (provider, source_name, title, description, url,
+             published_at, fetched_at, category, sentiment, image_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    def _seed(db, rows):
+        with db.conn:
+            db.conn.executemany(sql, [
+                (r["provider"], r.get("source_name", ""), r["title"], r.get("description", ""),
+                 r["url"], r["published_at"], r["fetched_at"], r.get("category", ""),
+                 r.get("sentiment"), r.get("image_url", ""))
+                for r in rows
+            ])
+    return _seed
+
+
+@pytest.fixture
+def seed_topics():
+    """Attach topics to an existing article id with one executemany."""
+    def _seed(db, article_id, topics):
+        with db.conn:
+            db.conn.executemany(
+                "INSERT OR IGNORE INTO news_article_topics (article_id, topic) VALUES (?, ?)",
+                [(article_id, t) for t in topics],
+            )
+    return _seed
+
+
 @pytest.fixture
 def sample_fred_meta():
     """Sample FRED series metadata dict."""
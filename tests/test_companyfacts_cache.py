@@ -0,0 +1,67 @@
+"""Tests for fetch_companyfacts_cached — gzip cache reads, writes, and corrupt entries."""
+
+import gzip
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sources.sec_edgar.tasks.field_analysis_pipeline import fetch_companyfacts_cached
+
+_FACTS = {"facts": {"us-gaap": {}}}
+_PAYLOAD = json.dumps(_FACTS).encode()
+
+
+class _Session:
+    def __init__(self, resp):
+        self.resp = resp
+        self.calls = 0
+
+    def get(self, url, rate_limiter=None):
+        self.calls += 1
+        return self.resp
+
+
+@pytest.fixture()
+def session(mock_response):
+    return _Session(mock_response(json_data=_FACTS))
+
+
+def test_fetch_writes_cache_atomically(tmp_path, session):
+    assert fetch_companyfacts_cached(session, "url", "0000000001", tmp_path) == _PAYLOAD
+    assert gzip.decompress((tmp_path / "0000000001.json.gz").read_bytes()) == _PAYLOAD
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # Second call is served from the cache
+    assert fetch_companyfacts_cached(session, "url", "0000000001", tmp_path) == _PAYLOAD
+    assert session.calls == 1
+
+
+@pytest.mark.parametrize("corrupt", [b"not gzip at all", gzip.compress(_PAYLOAD)[:-6]], ids=["garbage", "truncated"])
+def test_corrupt_cache_is_a_miss(tmp_path, session, corrupt):
+    (tmp_path / "0000000001.json.gz").write_bytes(corrupt)
+
+    assert fetch_companyfacts_cached(session, "url", "0000000001", tmp_path) == _PAYLOAD
+    assert session.calls == 1
+    assert gzip.decompress((tmp_path / "0000000001.json.gz").read_bytes()) == _PAYLOAD
+
+
+def test_concurrent_writers_of_one_cik(tmp_path, mock_response):
+    # Tickers sharing a CIK: every worker misses the cache, then all write at once
+    barrier = threading.Barrier(8)
+
+    class _BarrierSession:
+        def get(self, url, rate_limiter=None):
+            barrier.wait()
+            return mock_response(json_data=_FACTS)
+
+    session = _BarrierSession()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda _: fetch_companyfacts_cached(session, "url", "0000000001", tmp_path), range(8)
+        ))
+
+    assert results == [_PAYLOAD] * 8
+    assert gzip.decompress((tmp_path / "0000000001.json.gz").read_bytes()) == _PAYLOAD
+    assert not list(tmp_path.glob("*.tmp"))
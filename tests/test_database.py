@@ -1,9 +1,13 @@
 """Tests for DatabaseManager — news and FRED methods with real SQLite in tmpdir."""
 
+import sqlite3
+
 import pytest
 
 from database import DatabaseManager
 
+pytestmark = pytest.mark.database
+
 
 # ---------------------------------------------------------------------------
 # News Articles
@@ -44,17 +48,32 @@ class TestUpsertNewsArticles:
         topics = tmp_db.query("SELECT * FROM news_article_topics")
         assert len(topics) == 0
 
-    def test_null_sentiment(self, tmp_db, sample_news_article):
-        a = sample_news_article(sentiment=None)
-        tmp_db.upsert_news_articles([a])
-        rows = tmp_db.query("SELECT sentiment FROM news_articles")
-        assert rows[0]["sentiment"] is None
-
-    def test_float_sentiment(self, tmp_db, sample_news_article):
-        a = sample_news_article(sentiment=-2.5)
+    def test_topics_unique_per_article(self, tmp_db, sample_news_article, seed_articles, seed_topics):
+        seed_articles(tmp_db, [sample_news_article(url="http://a.com/1"), sample_news_article(url="http://a.com/2")])
+        ids = {r["url"]: r["id"] for r in tmp_db.query("SELECT id, url FROM news_articles")}
+        seed_topics(tmp_db, ids["http://a.com/1"], ["fed", "economy", "fed"])
+        seed_topics(tmp_db, ids["http://a.com/2"], ["fed"])
+
+        rows = tmp_db.query(
+            "SELECT a.url FROM news_article_topics t JOIN news_articles a ON a.id = t.article_id "
+            "WHERE t.topic = ? ORDER BY a.url", ("fed",)
+        )
+        assert [r["url"] for r in rows] == ["http://a.com/1", "http://a.com/2"]
+        assert len(tmp_db.query("SELECT * FROM news_article_topics")) == 3
+
+    def test_topics_require_existing_article(self, tmp_db, seed_topics):
+        with pytest.raises(sqlite3.IntegrityError):
+            seed_topics(tmp_db, 999, ["fed"])
+
+    @pytest.mark.parametrize("sentiment, expected", [
+        (None, None),
+        (-2.5, pytest.approx(-2.5)),
+    ], ids=["null", "float"])
+    def test_sentiment_roundtrip(self, tmp_db, sample_news_article, sentiment, expected):
+        a = sample_news_article(sentiment=sentiment)
         tmp_db.upsert_news_articles([a])
         rows = tmp_db.query("SELECT sentiment FROM news_articles")
-        assert rows[0]["sentiment"] == pytest.approx(-2.5)
+        assert rows[0]["sentiment"] == expected
 
 
 class TestGetNewsLatestFetch:
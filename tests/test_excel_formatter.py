@@ -0,0 +1,88 @@
+"""Tests for ExcelFormatter — queued sheets written to a tmpdir workbook."""
+
+import sqlite3
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from utils.excel_formatter import ExcelFormatter
+
+# pytest resets warning filters per test, undoing the module-level filter in excel_formatter
+pytestmark = pytest.mark.filterwarnings("ignore:In write-only mode you must add table columns manually")
+
+
+def _read_rows(path, sheet_name):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return [tuple(r) for r in wb[sheet_name].iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+class TestAddToSheet:
+    def test_frame_edits_after_queueing_are_not_saved(self, tmp_path):
+        df = pd.DataFrame({"n": [1, 2]})
+        xl = ExcelFormatter()
+        xl.add_to_sheet(df, "Frame")
+        df.loc[0, "n"] = 999
+        df.drop(index=1, inplace=True)
+        xl.save("frame.xlsx", location=str(tmp_path))
+
+        assert _read_rows(tmp_path / "frame.xlsx", "Frame") == [("n",), (1,), (2,)]
+
+
+class TestAsyncSave:
+    def test_queue_cleared_on_submit(self, tmp_path):
+        xl = ExcelFormatter()
+        xl.add_to_sheet(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}), "Frame")
+        xl.add_to_sheet_from_rows(((i, str(i)) for i in range(3)), ["n", "s"], "Gen")
+        future = xl.save("first.xlsx", location=str(tmp_path), async_save=True)
+        assert xl._pending == []
+
+        # A sheet queued while the first save runs lands in the next workbook only
+        xl.add_to_sheet(pd.DataFrame({"c": [9]}), "Frame")
+        future.result()
+        xl.save("second.xlsx", location=str(tmp_path))
+        xl.close()
+
+        assert openpyxl.load_workbook(tmp_path / "first.xlsx", read_only=True).sheetnames == ["Frame", "Gen"]
+        assert _read_rows(tmp_path / "first.xlsx", "Gen") == [("n", "s"), (0, "0"), (1, "1"), (2, "2")]
+        assert _read_rows(tmp_path / "second.xlsx", "Frame") == [("c",), (9,)]
+
+
+    def test_row_list_edits_after_save_call_are_not_saved(self, tmp_path):
+        rows = [(1, "a"), (2, "b")]
+        xl = ExcelFormatter()
+        xl.add_to_sheet_from_rows(rows, ["n", "s"], "Rows")
+        future = xl.save("rows.xlsx", location=str(tmp_path), async_save=True)
+        rows[0] = (999, "z")
+        rows.clear()
+        future.result()
+        xl.close()
+
+        assert _read_rows(tmp_path / "rows.xlsx", "Rows") == [("n", "s"), (1, "a"), (2, "b")]
+
+
+class TestRowsFromCursor:
+    @pytest.fixture()
+    def cursor(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (ticker TEXT, value REAL)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [("AAPL", 1.5), ("MSFT", 2.0), ("NVDA", 3.25)])
+        yield conn.execute("SELECT ticker, value FROM t ORDER BY ticker")
+        conn.close()
+
+    @pytest.mark.parametrize("async_save", [False, True])
+    def test_cursor_rows_written(self, tmp_path, cursor, async_save):
+        xl = ExcelFormatter()
+        xl.add_to_sheet_from_rows(cursor, ["ticker", "value"], "Facts", sample_widths=async_save)
+        future = xl.save("facts.xlsx", location=str(tmp_path), async_save=async_save)
+        if async_save:
+            # Raises sqlite3.ProgrammingError if the cursor was read on the writer thread
+            future.result()
+        xl.close()
+
+        assert _read_rows(tmp_path / "facts.xlsx", "Facts") == [
+            ("ticker", "value"), ("AAPL", 1.5), ("MSFT", 2), ("NVDA", 3.25),
+        ]
@@ -0,0 +1,80 @@
+"""Tests for field_analysis_pipeline — availability tier boundaries and shared JSON helpers."""
+
+import json
+import os
+
+import pytest
+
+from sources.sec_edgar.tasks.field_analysis_pipeline import (
+    TIER_DESCRIPTIONS,
+    _availability_tier,
+    dump_json,
+    load_json,
+)
+
+
+@pytest.mark.parametrize("pct, tier", [
+    (100.0, "universal"),
+    (90, "universal"),
+    (89.99, "very_common"),
+    (70, "very_common"),
+    (69.99, "common"),
+    (50, "common"),
+    (49.99, "moderate"),
+    (40, "moderate"),
+    (30, "moderate"),
+    (29.99, "rare"),
+    (10, "rare"),
+    (9.99, "very_rare"),
+    (0, "very_rare"),
+])
+def test_tier_lower_bounds_are_inclusive(pct, tier):
+    assert _availability_tier(pct) == tier
+
+
+def test_float_percentages_at_boundaries():
+    # count / total * 100 as computed in Phase 3
+    assert _availability_tier(9 / 10 * 100) == "universal"
+    assert _availability_tier(7 / 10 * 100) == "very_common"
+    assert _availability_tier(1 / 10 * 100) == "rare"
+
+
+def test_every_tier_is_described():
+    tiers = {_availability_tier(pct) for pct in range(0, 101)}
+    assert tiers == set(TIER_DESCRIPTIONS)
+
+
+class TestDumpJsonSkip:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "report.json")
+        obj = {"ticker": "AAPL", "values": [1, 2.5, None], "label": "Revenue – net"}
+        dump_json(obj, path)
+        assert load_json(path) == obj
+
+    def test_unchanged_output_not_rewritten(self, tmp_path):
+        path = str(tmp_path / "report.json")
+        assert dump_json({"a": 1}, path) is True
+        assert dump_json({"a": 1}, path) is False
+        assert dump_json({"a": 2}, path) is True
+        assert json.loads(open(path).read()) == {"a": 2}
+
+    def test_file_changed_on_disk_is_rewritten(self, tmp_path):
+        path = str(tmp_path / "report.json")
+        dump_json({"a": 1}, path)
+        expected = open(path, "rb").read()
+
+        # Hand edit of the same length, with the mtime moved on as an editor would
+        with open(path, "wb") as f:
+            f.write(expected.replace(b"1", b"7"))
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert dump_json({"a": 1}, path) is True
+        assert open(path, "rb").read() == expected
+
+    def test_missing_output_is_rewritten(self, tmp_path):
+        path = str(tmp_path / "report.json")
+        dump_json({"a": 1}, path)
+        os.remove(path)
+        assert dump_json({"a": 1}, path) is True
+        assert os.path.exists(path)
@@ -0,0 +1,92 @@
+"""Tests for task4_field_standardization — similar-field grouping, consolidation rules and priorities."""
+
+import importlib
+import json
+import sys
+
+import pytest
+
+from sources.sec_edgar.tasks import task4_field_standardization
+from sources.sec_edgar.tasks.task4_field_standardization import (
+    _cluster_similar_names,
+    create_consolidation_rules,
+    create_field_priority,
+    find_similar_fields,
+)
+
+# Name pairs that fuzzy-match (token_sort_ratio >= 85) but are different line items
+_LOOKALIKE_PAIRS = [
+    ("LiabilitiesCurrent", "LiabilitiesNoncurrent"),
+    ("InterestExpense", "InterestExpenseDebt"),
+]
+
+
+def _catalog_and_report(names):
+    catalog = {name: {"label": name, "taxonomy": "us-gaap", "companies_using": ["AAPL"]} for name in names}
+    report = {
+        "field_analysis": {
+            name: {"availability_percentage": 95.0, "availability_tier": "universal"} for name in names
+        }
+    }
+    return catalog, report
+
+
+@pytest.mark.parametrize("pair", _LOOKALIKE_PAIRS)
+def test_lookalike_names_cluster(pair):
+    assert _cluster_similar_names(list(pair)) == [sorted(pair)]
+
+
+@pytest.fixture
+def without_rapidfuzz(monkeypatch):
+    """task4_field_standardization reloaded with rapidfuzz unimportable (difflib fallback)."""
+    monkeypatch.setitem(sys.modules, "rapidfuzz", None)
+    monkeypatch.setitem(sys.modules, "rapidfuzz.fuzz", None)
+    yield importlib.reload(task4_field_standardization)
+    monkeypatch.undo()
+    importlib.reload(task4_field_standardization)
+
+
+def test_difflib_fallback(without_rapidfuzz):
+    mod = without_rapidfuzz
+    assert mod._name_ratio.__module__ == mod.__name__
+    for a, b in _LOOKALIKE_PAIRS:
+        assert mod._similar(a, b)
+    assert not mod._similar("Revenues", "Liabilities")
+
+
+@pytest.mark.parametrize("pair", _LOOKALIKE_PAIRS)
+def test_fuzzy_groups_need_review_and_are_not_consolidated(pair):
+    catalog, report = _catalog_and_report(pair)
+    groups = find_similar_fields(catalog, {}, report)
+
+    assert [sorted(f["field_name"] for f in g["fields"]) for g in groups] == [sorted(pair)]
+    assert groups[0]["needs_review"] is True
+    assert create_consolidation_rules(groups, {}) == []
+
+
+def test_pattern_groups_still_consolidated():
+    catalog, report = _catalog_and_report(["Revenues", "RevenueFromContractWithCustomerExcludingAssessedTax"])
+    groups = find_similar_fields(catalog, {}, report)
+    priority = {"Revenues": {"priority_score": 130.0}}
+
+    rules = create_consolidation_rules(groups, priority)
+    assert [(r["concept"], r["primary_field"]) for r in rules] == [("Revenue", "Revenues")]
+
+
+def test_priority_scores_keep_report_types():
+    catalog = {
+        "Revenues": {"taxonomy": "us-gaap", "label": "Revenues"},
+        "Unlisted": {"taxonomy": "us-gaap", "label": "Unlisted"},
+        "Rare": {"taxonomy": "ifrs-full", "label": "Rare"},
+    }
+    report = {"field_analysis": {
+        "Revenues": {"availability_percentage": 95.0, "is_critical": True, "availability_tier": "universal"},
+        "Rare": {"availability_percentage": 0.0, "availability_tier": "very_rare"},
+    }}
+    priority = create_field_priority(catalog, report, {"Rare"})
+
+    assert list(priority) == ["Revenues", "Unlisted", "Rare"]
+    scores = [info["priority_score"] for info in priority.values()]
+    assert [type(s) for s in scores] == [float, int, float]
+    assert json.dumps(scores) == "[175.0, 5, -100.0]"
+
@@ -2,35 +2,60 @@
 
 import datetime
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from database import DatabaseManager
+from sources.fred import pipeline as fred_pipeline_mod
+
+pytestmark = pytest.mark.database
+
+
+class _FakeProvider:
+    """Stand-in FredProvider that counts calls (cheaper than a MagicMock)."""
+    __slots__ = ("name", "_info", "_obs", "calls_info", "calls_obs", "raise_info")
+
+    def __init__(self, info, observations):
+        self.name = "FRED"
+        self._info = info
+        self._obs = observations
+        self.calls_info = 0
+        self.calls_obs = 0
+        self.raise_info = None
+
+    def get_series_info(self, series_id):
+        self.calls_info += 1
+        if self.raise_info:
+            raise self.raise_info
+        return self._info
+
+    def get_observations(self, *args, **kwargs):
+        self.calls_obs += 1
+        return self._obs
 
 
 def _make_mock_provider():
-    """Create a mock FredProvider."""
-    provider = MagicMock()
-    provider.name = "FRED"
-    provider.get_series_info.return_value = {
-        "series_id": "GDP",
-        "title": "Gross Domestic Product",
-        "units": "Billions of Dollars",
-        "frequency": "Quarterly",
-        "seasonal_adj": "Seasonally Adjusted",
-        "last_updated": "2025-01-15",
-        "notes": "GDP notes",
-    }
-    provider.get_observations.return_value = [
-        {"series_id": "GDP", "date": "2024-01-01", "value": 27000.0},
-        {"series_id": "GDP", "date": "2024-04-01", "value": 27500.0},
-    ]
-    return provider
+    """Create a fake FredProvider."""
+    return _FakeProvider(
+        info={
+            "series_id": "GDP",
+            "title": "Gross Domestic Product",
+            "units": "Billions of Dollars",
+            "frequency": "Quarterly",
+            "seasonal_adj": "Seasonally Adjusted",
+            "last_updated": "2025-01-15",
+            "notes": "GDP notes",
+        },
+        observations=[
+            {"series_id": "GDP", "date": "2024-01-01", "value": 27000.0},
+            {"series_id": "GDP", "date": "2024-04-01", "value": 27500.0},
+        ],
+    )
 
 
 @pytest.fixture
-def pipeline_db(tmp_path):
+def pipeline_db(memory_db_path):
     """Yield db_path for pipeline tests. Pre-create schema."""
-    db_path = str(tmp_path / "pipeline.db")
+    db_path = memory_db_path
     db = DatabaseManager(db_path=db_path)
     yield db, db_path
     db.close()
@@ -42,34 +67,28 @@ class TestFredPipeline:
     def _run_pipeline(self, db_path, mock_provider, series_ids=None, force=False):
         """Run FredPipeline.__init__ with mocks in place."""
         series_ids = series_ids or ["GDP"]
-        with patch("sources.fred.pipeline.FredProvider", return_value=mock_provider), \
-             patch("sources.fred.pipeline.DatabaseManager", side_effect=lambda *a, **kw: DatabaseManager(db_path=db_path)), \
-             patch("sources.fred.pipeline.log"), \
-             patch("sources.fred.pipeline.load_dotenv"):
-
-            from sources.fred.pipeline import FredPipeline
-            FredPipeline(series_ids=series_ids, days=365, force=force)
+        with patch.object(fred_pipeline_mod, "FredProvider", return_value=mock_provider), \
+             patch.object(fred_pipeline_mod, "DatabaseManager", side_effect=lambda *a, **kw: DatabaseManager(db_path=db_path)), \
+             patch.object(fred_pipeline_mod, "log"), \
+             patch.object(fred_pipeline_mod, "load_dotenv"):
 
-        # Return a fresh connection for assertions
-        return DatabaseManager(db_path=db_path)
+            fred_pipeline_mod.FredPipeline(series_ids=series_ids, days=365, force=force)
 
     def test_end_to_end(self, pipeline_db):
         db, db_path = pipeline_db
         mock_provider = _make_mock_provider()
-        result_db = self._run_pipeline(db_path, mock_provider)
-        rows = result_db.query("SELECT * FROM fred_observations ORDER BY date")
+        self._run_pipeline(db_path, mock_provider)
+        rows = db.query("SELECT * FROM fred_observations ORDER BY date")
         assert len(rows) >= 2
         assert rows[0]["series_id"] == "GDP"
-        result_db.close()
 
     def test_metadata_persisted(self, pipeline_db):
         db, db_path = pipeline_db
         mock_provider = _make_mock_provider()
-        result_db = self._run_pipeline(db_path, mock_provider)
-        meta = result_db.query("SELECT * FROM fred_series_meta WHERE series_id = 'GDP'")
+        self._run_pipeline(db_path, mock_provider)
+        meta = db.query("SELECT * FROM fred_series_meta WHERE series_id = 'GDP'")
         assert len(meta) == 1
         assert meta[0]["title"] == "Gross Domestic Product"
-        result_db.close()
 
     def test_cache_skip(self, pipeline_db):
         """If latest observation is today, provider should not be called."""
@@ -82,7 +101,7 @@ class TestFredPipeline:
         }])
         mock_provider = _make_mock_provider()
         self._run_pipeline(db_path, mock_provider, force=False)
-        mock_provider.get_series_info.assert_not_called()
+        assert mock_provider.calls_info == 0
 
     def test_force_override(self, pipeline_db):
         """force=True should call provider even if cache is fresh."""
@@ -95,12 +114,12 @@ class TestFredPipeline:
         }])
         mock_provider = _make_mock_provider()
         self._run_pipeline(db_path, mock_provider, force=True)
-        mock_provider.get_series_info.assert_called_once()
+        assert mock_provider.calls_info == 1
 
     def test_error_resilience(self, pipeline_db):
         """Provider exception should not crash the pipeline."""
         db, db_path = pipeline_db
         mock_provider = _make_mock_provider()
-        mock_provider.get_series_info.side_effect = RuntimeError("API down")
+        mock_provider.raise_info = RuntimeError("API down")
         # Should not raise
         self._run_pipeline(db_path, mock_provider, series_ids=["GDP", "UNRATE"])
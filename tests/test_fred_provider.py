@@ -1,26 +1,31 @@
 """Tests for FredProvider with mocked HTTP."""
 
+import types
+
 import pytest
 from unittest.mock import patch, MagicMock
 
+from sources.fred import provider as fred_provider_mod
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_response(status_code=200, json_data=None):
-    resp = MagicMock()
-    resp.status_code = status_code
-    resp.json.return_value = json_data or {}
-    resp.__bool__ = lambda self: self.status_code == 200
-    return resp
+@pytest.fixture(scope="module")
+def fred_provider():
+    """One FredProvider for the module; its session is a plain namespace."""
+    with patch.object(fred_provider_mod, "RequestSession"):
+        provider = fred_provider_mod.FredProvider(api_key="test-key")
+    provider.session = types.SimpleNamespace(get=None)
+    return provider
 
 
-def _make_provider(api_key="test-key"):
-    """Create a FredProvider with mocked RequestSession."""
-    with patch("sources.fred.provider.RequestSession"):
-        from sources.fred.provider import FredProvider
-        return FredProvider(api_key=api_key)
+@pytest.fixture
+def provider(fred_provider):
+    """The shared provider with a fresh session.get mock for this test."""
+    fred_provider.session.get = MagicMock()
+    return fred_provider
 
 
 # ---------------------------------------------------------------------------
@@ -28,9 +33,8 @@ def _make_provider(api_key="test-key"):
 # ---------------------------------------------------------------------------
 
 class TestGetSeriesInfo:
-    def test_parses_metadata(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={
+    def test_parses_metadata(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={
             "serieses": [{
                 "id": "GDP",
                 "title": "Gross Domestic Product",
@@ -47,9 +51,8 @@ class TestGetSeriesInfo:
         assert result["units"] == "Billions of Dollars"
         assert result["seasonal_adj"] == "Seasonally Adjusted"
 
-    def test_correct_url_and_params(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={
+    def test_correct_url_and_params(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={
             "serieses": [{"id": "GDP"}]
         })
         provider.get_series_info("GDP")
@@ -58,14 +61,12 @@ class TestGetSeriesInfo:
         assert kwargs["params"]["series_id"] == "GDP"
         assert kwargs["params"]["api_key"] == "test-key"
 
-    def test_empty_serieses_raises(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={"serieses": []})
+    def test_empty_serieses_raises(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={"serieses": []})
         with pytest.raises(RuntimeError, match="No series found"):
             provider.get_series_info("BADID")
 
-    def test_none_response_raises(self):
-        provider = _make_provider()
+    def test_none_response_raises(self, provider):
         provider.session.get.return_value = None
         with pytest.raises(RuntimeError, match="Failed to fetch"):
             provider.get_series_info("GDP")
@@ -76,9 +77,8 @@ class TestGetSeriesInfo:
 # ---------------------------------------------------------------------------
 
 class TestGetObservations:
-    def test_numeric_values_to_float(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={
+    def test_numeric_values_to_float(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={
             "observations": [
                 {"date": "2024-01-01", "value": "27000.5"},
                 {"date": "2024-04-01", "value": "27500.0"},
@@ -89,37 +89,32 @@ class TestGetObservations:
         assert result[1]["value"] == pytest.approx(27500.0)
         assert result[0]["series_id"] == "GDP"
 
-    def test_dot_value_becomes_none(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={
+    def test_dot_value_becomes_none(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={
             "observations": [{"date": "2024-07-01", "value": "."}]
         })
         result = provider.get_observations("GDP")
         assert result[0]["value"] is None
 
-    def test_start_end_date_params(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={"observations": []})
+    def test_start_end_date_params(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={"observations": []})
         provider.get_observations("GDP", start_date="2024-01-01", end_date="2024-12-31")
         _, kwargs = provider.session.get.call_args
         assert kwargs["params"]["observation_start"] == "2024-01-01"
         assert kwargs["params"]["observation_end"] == "2024-12-31"
 
-    def test_no_dates_omits_params(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={"observations": []})
+    def test_no_dates_omits_params(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={"observations": []})
         provider.get_observations("GDP")
         _, kwargs = provider.session.get.call_args
         assert "observation_start" not in kwargs["params"]
         assert "observation_end" not in kwargs["params"]
 
-    def test_empty_observations(self):
-        provider = _make_provider()
-        provider.session.get.return_value = _make_response(json_data={"observations": []})
+    def test_empty_observations(self, provider, mock_response):
+        provider.session.get.return_value = mock_response(json_data={"observations": []})
         assert provider.get_observations("GDP") == []
 
-    def test_none_response_raises(self):
-        provider = _make_provider()
+    def test_none_response_raises(self, provider):
         provider.session.get.return_value = None
         with pytest.raises(RuntimeError, match="Failed to fetch"):
             provider.get_observations("GDP")
@@ -131,15 +126,13 @@ class TestGetObservations:
 
 class TestInit:
     def test_missing_key_raises(self):
-        with patch("sources.fred.provider.RequestSession"):
+        with patch.object(fred_provider_mod, "RequestSession"):
             with patch.dict("os.environ", {}, clear=True):
-                from sources.fred.provider import FredProvider
                 with pytest.raises(ValueError, match="FRED API key required"):
-                    FredProvider(api_key="")
+                    fred_provider_mod.FredProvider(api_key="")
 
     def test_reads_env_key(self):
-        with patch("sources.fred.provider.RequestSession"):
+        with patch.object(fred_provider_mod, "RequestSession"):
             with patch.dict("os.environ", {"FRED_API_KEY": "env-key-123"}):
-                from sources.fred.provider import FredProvider
-                p = FredProvider()
+                p = fred_provider_mod.FredProvider()
                 assert p.api_key == "env-key-123"
@@ -0,0 +1,36 @@
+"""Tests for utils.input_parser — ticker file parsing."""
+
+from utils.input_parser import parse_input_file
+
+
+def _parse(tmp_path, text):
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.encode())
+    return parse_input_file(str(path))
+
+
+def test_one_ticker_per_line(tmp_path):
+    assert _parse(tmp_path, "AAPL\nmsft\nNvda\n") == ["AAPL", "MSFT", "NVDA"]
+
+
+def test_comments_and_blank_lines_skipped(tmp_path):
+    text = "# watchlist\n\nAAPL\n   \n\t\n#MSFT\n   # indented comment\nNVDA"
+    assert _parse(tmp_path, text) == ["AAPL", "NVDA"]
+
+
+def test_indentation_and_trailing_comments_stripped(tmp_path):
+    text = "  AAPL  \n\tmsft # big tech\nBRK.B#class B\n   TSM\t# ADR  \n"
+    assert _parse(tmp_path, text) == ["AAPL", "MSFT", "BRK.B", "TSM"]
+
+
+def test_unicode_whitespace_only_lines_skipped(tmp_path):
+    assert _parse(tmp_path, "AAPL\n\xa0\n\u2003 \u00a0# nbsp\nMSFT # x") == ["AAPL", "MSFT"]
+
+
+def test_crlf_line_endings(tmp_path):
+    assert _parse(tmp_path, "AAPL\r\n# skip\r\n\r\nMSFT # x\r\n") == ["AAPL", "MSFT"]
+
+
+def test_empty_file(tmp_path):
+    assert _parse(tmp_path, "") == []
+    assert _parse(tmp_path, "# only comments\n\n") == []
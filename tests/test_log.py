@@ -0,0 +1,109 @@
+"""Tests for utils.log — env-driven gating and color selection (read at import)."""
+
+import importlib
+import io
+import sys
+
+import pytest
+
+from utils import log
+
+_ENV = ("LOG_LEVEL", "LOG_QUIET", "LOG_PROGRESS_QUIET", "NO_COLOR")
+
+
+class _Stdout(io.StringIO):
+    def __init__(self, tty):
+        super().__init__()
+        self._tty = tty
+
+    def isatty(self):
+        return self._tty
+
+
+@pytest.fixture
+def load_log(monkeypatch):
+    """Reload utils.log under the given env vars with a fake stdout; returns (module, stdout)."""
+    def _load(tty=False, **env):
+        for name in _ENV:
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        out = _Stdout(tty)
+        monkeypatch.setattr(sys, "stdout", out)
+        return importlib.reload(log), out
+
+    yield _load
+    monkeypatch.undo()
+    importlib.reload(log)
+
+
+def _emit_all(mod):
+    mod.header("Header")
+    mod.step("step")
+    mod.info("info")
+    mod.ok("ok")
+    mod.warn("warn")
+    mod.err("err")
+    mod.ticker_msg("AAPL", "ticker")
+    mod.progress(1, 2, "MSFT", "progress")
+    mod.summary_table("Summary", [("rows", "3")])
+
+
+def _emitted(out):
+    text = out.getvalue()
+    return {word for word in ("Header", "step", "info", "ok", "warn", "err", "ticker", "progress", "Summary") if word in text}
+
+
+_EVERYTHING = {"Header", "step", "info", "ok", "warn", "err", "ticker", "progress", "Summary"}
+_CHATTY = {"info", "ticker", "progress"}
+
+
+class TestGating:
+    def test_default_emits_everything(self, load_log):
+        mod, out = load_log()
+        _emit_all(mod)
+        assert _emitted(out) == _EVERYTHING
+
+    @pytest.mark.parametrize("value", ["1", "true", "yes"])
+    def test_log_quiet_silences_all(self, load_log, value):
+        mod, out = load_log(LOG_QUIET=value)
+        _emit_all(mod)
+        assert out.getvalue() == ""
+
+    @pytest.mark.parametrize("value", ["", "0", "false", "no"])
+    def test_log_quiet_falsy_values(self, load_log, value):
+        mod, out = load_log(LOG_QUIET=value)
+        _emit_all(mod)
+        assert _emitted(out) == _EVERYTHING
+
+    def test_progress_quiet_only_drops_progress(self, load_log):
+        mod, out = load_log(LOG_PROGRESS_QUIET="1")
+        _emit_all(mod)
+        assert _emitted(out) == _EVERYTHING - {"progress"}
+
+    @pytest.mark.parametrize("level", ["WARNING", "30", "error"])
+    def test_level_above_info_drops_chatty_emitters(self, load_log, level):
+        mod, out = load_log(LOG_LEVEL=level)
+        _emit_all(mod)
+        assert _emitted(out) == _EVERYTHING - _CHATTY
+
+
+class TestColor:
+    def test_tty_gets_ansi(self, load_log):
+        mod, out = load_log(tty=True)
+        mod.ok("done")
+        assert out.getvalue().startswith("\x1b[32m\x1b[1m[")
+        assert out.getvalue().endswith("\x1b[0m\n")
+        assert mod.C.OK == "\x1b[32m\x1b[1m"
+
+    def test_pipe_gets_plain_text(self, load_log):
+        mod, out = load_log(tty=False)
+        _emit_all(mod)
+        assert "\x1b" not in out.getvalue()
+        assert mod.C.OK == mod.C.RESET == ""
+
+    def test_no_color_wins_over_tty(self, load_log):
+        mod, out = load_log(tty=True, NO_COLOR="1")
+        _emit_all(mod)
+        assert "\x1b" not in out.getvalue()
+        assert mod.C.OK == ""
@@ -6,45 +6,54 @@ from pydantic import ValidationError
 from models import NewsArticle, FredSeriesMeta, FredObservation
 
 
+# Read-only instances shared by the tests that only inspect field values
+
+@pytest.fixture(scope="module")
+def default_news_article():
+    return NewsArticle(provider="gdelt", title="T", url="http://x.com", published_at="2025-01-01")
+
+
+@pytest.fixture(scope="module")
+def default_fred_meta():
+    return FredSeriesMeta(series_id="GDP")
+
+
 # ---------------------------------------------------------------------------
 # NewsArticle
 # ---------------------------------------------------------------------------
 
 class TestNewsArticle:
-    def test_required_fields(self):
-        a = NewsArticle(provider="gdelt", title="T", url="http://x.com", published_at="2025-01-01")
+    def test_required_fields(self, default_news_article):
+        a = default_news_article
         assert a.provider == "gdelt"
         assert a.title == "T"
         assert a.url == "http://x.com"
         assert a.published_at == "2025-01-01"
 
-    def test_optional_sentiment_defaults_none(self):
-        a = NewsArticle(provider="p", title="T", url="http://x.com", published_at="2025-01-01")
+    def test_optional_sentiment_defaults_none(self, default_news_article):
+        a = default_news_article
         assert a.sentiment is None
 
-    def test_topics_defaults_empty(self):
-        a = NewsArticle(provider="p", title="T", url="http://x.com", published_at="2025-01-01")
+    def test_topics_defaults_empty(self, default_news_article):
+        a = default_news_article
         assert a.topics == []
 
-    def test_all_optional_defaults(self):
-        a = NewsArticle(provider="p", title="T", url="http://x.com", published_at="2025-01-01")
+    def test_all_optional_defaults(self, default_news_article):
+        a = default_news_article
         assert a.source_name == ""
         assert a.description == ""
         assert a.fetched_at == ""
         assert a.category == ""
         assert a.image_url == ""
 
-    def test_missing_provider_raises(self):
-        with pytest.raises(ValidationError):
-            NewsArticle(title="T", url="http://x.com", published_at="2025-01-01")
-
-    def test_missing_title_raises(self):
-        with pytest.raises(ValidationError):
-            NewsArticle(provider="p", url="http://x.com", published_at="2025-01-01")
-
-    def test_missing_url_raises(self):
+    @pytest.mark.parametrize("kwargs", [
+        {"title": "T", "url": "http://x.com", "published_at": "2025-01-01"},
+        {"provider": "p", "url": "http://x.com", "published_at": "2025-01-01"},
+        {"provider": "p", "title": "T", "published_at": "2025-01-01"},
+    ], ids=["provider", "title", "url"])
+    def test_missing_required_raises(self, kwargs):
         with pytest.raises(ValidationError):
-            NewsArticle(provider="p", title="T", published_at="2025-01-01")
+            NewsArticle(**kwargs)
 
 
 # ---------------------------------------------------------------------------
@@ -52,12 +61,12 @@ class TestNewsArticle:
 # ---------------------------------------------------------------------------
 
 class TestFredSeriesMeta:
-    def test_required_series_id(self):
-        m = FredSeriesMeta(series_id="GDP")
+    def test_required_series_id(self, default_fred_meta):
+        m = default_fred_meta
         assert m.series_id == "GDP"
 
-    def test_defaults_empty_strings(self):
-        m = FredSeriesMeta(series_id="GDP")
+    def test_defaults_empty_strings(self, default_fred_meta):
+        m = default_fred_meta
         assert m.title == ""
         assert m.units == ""
         assert m.frequency == ""
@@ -1,7 +1,7 @@
 """Tests for the NLP sentiment enrichment pipeline."""
 
 import pytest
-from sources.news.enrich_sentiment import SentimentEnricher
+from sources.news.enrich_sentiment import SentimentEnricher, _get_analyzer, _label
 
 
 # ---------------------------------------------------------------------------
@@ -14,62 +14,71 @@ def enricher(tmp_db):
     e = SentimentEnricher.__new__(SentimentEnricher)
     e.db = tmp_db
     e.batch_size = 500
-    e.analyzer = SentimentEnricher._init_vader()
+    e.analyzer = _get_analyzer()
     return e
 
 
+_INSERT_SQL = """
+    INSERT INTO news_articles
+        (provider, source_name, title, description, url,
+         published_at, fetched_at, category, sentiment, image_url,
+         sentiment_label, sentiment_source)
+    VALUES (?, '', ?, ?, ?, '2025-01-01T00:00:00Z', '2025-01-01T00:00:00Z',
+            '', ?, '', '', ?)
+"""
+
+
+def _insert_articles(db, rows):
+    """Insert (provider, title, description, url, sentiment, sentiment_source) rows in one commit."""
+    with db.conn:
+        db.conn.executemany(_INSERT_SQL, rows)
+
+
 def _insert_article(db, url, title="Title", description="Desc", provider="test",
                      sentiment=None, sentiment_source=""):
     """Helper to insert a raw article into the temp DB."""
-    db.conn.execute(
-        """INSERT INTO news_articles
-            (provider, source_name, title, description, url,
-             published_at, fetched_at, category, sentiment, image_url,
-             sentiment_label, sentiment_source)
-        VALUES (?, '', ?, ?, ?, '2025-01-01T00:00:00Z', '2025-01-01T00:00:00Z',
-                '', ?, '', '', ?)""",
-        (provider, title, description, url, sentiment, sentiment_source),
-    )
-    db.conn.commit()
+    _insert_articles(db, [(provider, title, description, url, sentiment, sentiment_source)])
 
 
 # ---------------------------------------------------------------------------
 # score() tests
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def scorer():
+    """DB-less SentimentEnricher shared by the pure scoring tests."""
+    e = SentimentEnricher.__new__(SentimentEnricher)
+    e.analyzer = _get_analyzer()
+    return e
+
+
 class TestScore:
-    def test_positive_text(self, enricher):
-        result = enricher.score("This is an amazing, wonderful, great achievement!")
-        assert result["compound"] > 0
-        assert result["label"] == "positive"
-
-    def test_negative_text(self, enricher):
-        result = enricher.score("This is terrible, horrible, and absolutely awful.")
-        assert result["compound"] < 0
-        assert result["label"] == "negative"
-
-    def test_neutral_text(self, enricher):
-        result = enricher.score("The meeting is scheduled for Tuesday.")
-        assert result["label"] == "neutral"
-        assert -0.05 < result["compound"] < 0.05
-
-    def test_empty_string(self, enricher):
-        result = enricher.score("")
-        assert result["label"] == "neutral"
-        assert result["compound"] == 0.0
-
-    def test_label_threshold_positive(self, enricher):
-        """Compound exactly at 0.05 should be positive."""
-        # We can't easily force VADER to a specific score, so just verify
-        # the threshold logic with a known-positive string
-        result = enricher.score("good")
-        assert result["compound"] >= 0.05
-        assert result["label"] == "positive"
-
-    def test_label_threshold_negative(self, enricher):
-        result = enricher.score("bad")
-        assert result["compound"] <= -0.05
-        assert result["label"] == "negative"
+    @pytest.mark.parametrize("text, label", [
+        ("This is an amazing, wonderful, great achievement!", "positive"),
+        ("This is terrible, horrible, and absolutely awful.", "negative"),
+        ("The meeting is scheduled for Tuesday.", "neutral"),
+        ("", "neutral"),
+        ("good", "positive"),
+        ("bad", "negative"),
+    ], ids=["positive", "negative", "neutral", "empty", "good", "bad"])
+    def test_label(self, scorer, text, label):
+        result = scorer.score(text)
+        assert result["label"] == label
+        if label == "positive":
+            assert result["compound"] >= 0.05
+        elif label == "negative":
+            assert result["compound"] <= -0.05
+        else:
+            assert -0.05 < result["compound"] < 0.05
+
+    def test_empty_string_scores_zero(self, scorer):
+        assert scorer.score("")["compound"] == 0.0
+
+    @pytest.mark.parametrize("compound, label", [
+        (0.05, "positive"), (0.0499, "neutral"), (-0.0499, "neutral"), (-0.05, "negative"),
+    ])
+    def test_label_thresholds(self, compound, label):
+        assert _label(compound) == label
 
 
 # ---------------------------------------------------------------------------
@@ -91,8 +100,9 @@ class TestDBMethods:
         assert len(rows) == 2
 
     def test_get_unenriched_articles_limit(self, tmp_db):
-        for i in range(5):
-            _insert_article(tmp_db, f"https://a.com/{i}")
+        _insert_articles(tmp_db, [
+            ("test", "Title", "Desc", f"https://a.com/{i}", None, "") for i in range(5)
+        ])
         rows = tmp_db.get_unenriched_articles(limit=2)
         assert len(rows) == 2
 
@@ -109,6 +119,22 @@ class TestDBMethods:
         assert result[0]["sentiment_label"] == "positive"
         assert result[0]["sentiment_source"] == "vader"
 
+    def test_update_article_sentiments_bulk(self, tmp_db):
+        _insert_article(tmp_db, "https://a.com/1")
+        _insert_article(tmp_db, "https://a.com/2")
+        ids = [r["id"] for r in tmp_db.get_unenriched_articles()]
+
+        tmp_db.update_article_sentiments([
+            (0.6, "positive", "vader", ids[0]),
+            (-0.4, "negative", "vader", ids[1]),
+        ])
+        tmp_db.conn.commit()
+
+        result = tmp_db.query("SELECT sentiment, sentiment_label FROM news_articles ORDER BY id")
+        assert [r["sentiment"] for r in result] == [0.6, -0.4]
+        assert [r["sentiment_label"] for r in result] == ["positive", "negative"]
+        assert tmp_db.get_unenriched_articles() == []
+
 
 # ---------------------------------------------------------------------------
 # enrich_articles() integration tests
@@ -156,6 +182,15 @@ class TestEnrichArticles:
         rows = enricher.db.query("SELECT sentiment, sentiment_label FROM news_articles")
         assert rows[0]["sentiment_label"] == "neutral"
 
+    def test_multiple_write_batches(self, enricher):
+        enricher.batch_size = 2
+        _insert_articles(enricher.db, [
+            ("test", "Great news", "Desc", f"https://a.com/{i}", None, "") for i in range(5)
+        ])
+
+        assert enricher.enrich_articles() == 5
+        assert enricher.db.get_unenriched_articles() == []
+
     def test_no_articles_returns_zero(self, enricher):
         count = enricher.enrich_articles()
         assert count == 0
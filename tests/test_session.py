@@ -0,0 +1,80 @@
+"""Tests for utils.session — RateLimiter token bucket on a fake clock."""
+
+import pytest
+
+from utils import session
+from utils.session import RateLimiter
+
+
+class _FakeClock:
+    """Stands in for the time module: sleep() advances monotonic() instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(session, "time", clock)
+    return clock
+
+
+def test_initial_burst_does_not_wait(clock):
+    limiter = RateLimiter(10)
+    for _ in range(10):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_burst_beyond_capacity_is_paced(clock):
+    limiter = RateLimiter(10)
+    start = clock.now
+    for _ in range(30):
+        limiter.acquire()
+
+    # 10 tokens up front, then 20 more at 10/s
+    assert clock.now - start == pytest.approx(2.0)
+    assert all(s == pytest.approx(0.1) for s in clock.sleeps)
+    assert len(clock.sleeps) == 20
+
+
+def test_idle_time_refills_up_to_capacity(clock):
+    limiter = RateLimiter(5, burst=2)
+    for _ in range(2):
+        limiter.acquire()
+    clock.now += 60
+    for _ in range(2):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.2)]
+
+
+def test_get_uses_limiter_instead_of_random_delay(clock):
+    class _Limiter:
+        acquired = 0
+
+        def acquire(self):
+            self.acquired += 1
+
+    class _HttpSession:
+        def get(self, url):
+            return type("Resp", (), {"status_code": 200})()
+
+    req = session.RequestSession.__new__(session.RequestSession)
+    req.session = _HttpSession()
+    limiter = _Limiter()
+
+    assert req.get("https://example.com", rate_limiter=limiter).status_code == 200
+    assert limiter.acquired == 1
+    assert clock.sleeps == []
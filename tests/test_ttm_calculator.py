@@ -0,0 +1,103 @@
+"""Tests for TrailingMetricsCalculator — streamed vs. whole-payload companyfacts parsing."""
+
+import json
+import pickle
+
+import pytest
+
+from sources.sec_edgar.tasks import task4_ttm_calculator
+from sources.sec_edgar.tasks.task4_ttm_calculator import TTM_CONCEPT_FIELDS, TrailingMetricsCalculator
+
+ijson = pytest.importorskip("ijson")
+
+
+def _fact(end, val, fp="FY", form="10-K"):
+    return {"end": end, "val": val, "fp": fp, "form": form, "accn": "0000000000-24-000001"}
+
+
+_COMPANYFACTS = {
+    "cik": 320193,
+    "entityName": "Test Co",
+    "facts": {
+        "dei": {
+            "EntityCommonStockSharesOutstanding": {"units": {"shares": [_fact("2024-01-01", 100)]}},
+        },
+        "us-gaap": {
+            "Assets": {"label": "Assets", "units": {"USD": [_fact("2023-12-31", 5.5e9)]}},
+            "Revenues": {
+                "label": "Revenues",
+                "units": {"USD": [_fact("2023-12-31", 383285000000), _fact("2023-09-30", 89.5, "Q3", "10-Q")]},
+            },
+            "NetIncomeLoss": {
+                "units": {"USD": [_fact("2023-12-31", -1.25), {"end": "2022-12-31", "fp": "FY"}]},
+                "description": "nested {\"units\": [1, 2]} text",
+            },
+            "ProfitLoss": {"units": {"USD": [], "EUR": [_fact("2023-06-30", 7, "Q2", "10-Q")]}},
+        },
+        "ifrs-full": {
+            "Revenue": {"units": {"EUR": [_fact("2023-12-31", 1.0)]}},
+        },
+    },
+}
+
+
+@pytest.fixture()
+def calculator():
+    # _stream_concept_facts/build_value_map don't touch instance state; skip the HTTP session setup
+    return TrailingMetricsCalculator.__new__(TrailingMetricsCalculator)
+
+
+def test_streamed_value_maps_match_full_parse(calculator):
+    raw = json.dumps(_COMPANYFACTS).encode()
+    streamed = calculator._stream_concept_facts(raw)
+    # Same whole-payload parse _load_value_maps uses below STREAM_PARSE_MIN_BYTES
+    orjson = task4_ttm_calculator.orjson
+    full = (orjson.loads(raw) if orjson is not None else json.loads(raw))["facts"]
+
+    for concept in TTM_CONCEPT_FIELDS:
+        assert calculator.build_value_map(streamed, concept) == calculator.build_value_map(full, concept)
+    assert streamed == {
+        "us-gaap": {name: {"units": full["us-gaap"][name]["units"]} for name in ("Revenues", "NetIncomeLoss", "ProfitLoss")},
+        "ifrs-full": {"Revenue": {"units": full["ifrs-full"]["Revenue"]["units"]}},
+    }
+
+
+def test_missing_fields_are_absent(calculator):
+    raw = json.dumps({"facts": {"us-gaap": {"Assets": {"units": {"USD": []}}}}}).encode()
+    assert calculator._stream_concept_facts(raw) == {}
+
+
+class TestValueMapCache:
+    @pytest.fixture()
+    def cached_calculator(self, calculator, tmp_path, monkeypatch):
+        self.fetches = 0
+
+        def fetch(reqsesh, url, cik, cache_dir, rate_limiter=None):
+            self.fetches += 1
+            return json.dumps(_COMPANYFACTS).encode()
+
+        monkeypatch.setattr(task4_ttm_calculator, "fetch_companyfacts_cached", fetch)
+        calculator.cache_dir = str(tmp_path)
+        calculator.reqsesh = calculator.rate_limiter = None
+        return calculator
+
+    def _pickle_path(self, tmp_path):
+        return tmp_path / f"0000320193.value_map.{task4_ttm_calculator.VALUE_MAP_CACHE_KEY}.pkl"
+
+    def test_value_maps_cached(self, cached_calculator, tmp_path):
+        value_maps = cached_calculator._load_value_maps("0000320193", "url")
+        assert set(value_maps) == set(TTM_CONCEPT_FIELDS)
+        assert pickle.loads(self._pickle_path(tmp_path).read_bytes()) == value_maps
+        assert not list(tmp_path.glob("*.tmp"))
+
+        assert cached_calculator._load_value_maps("0000320193", "url") == value_maps
+        assert self.fetches == 1
+
+    @pytest.mark.parametrize("corrupt", [b"", b"garbage", pickle.dumps({"Revenue": {}})[:-3]])
+    def test_corrupt_pickle_is_a_miss(self, cached_calculator, tmp_path, corrupt):
+        self._pickle_path(tmp_path).write_bytes(corrupt)
+
+        value_maps = cached_calculator._load_value_maps("0000320193", "url")
+        assert set(value_maps) == set(TTM_CONCEPT_FIELDS)
+        assert self.fetches == 1
+        assert pickle.loads(self._pickle_path(tmp_path).read_bytes()) == value_maps
@@ -7,21 +7,50 @@ You can also return a reference to the original data to perform some logical man
 """
 
 import sys, os
+import itertools
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable
+import numpy as np
 import pandas as pd
 import openpyxl 
 from openpyxl import Workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from openpyxl.utils import get_column_letter
-from openpyxl.utils.dataframe import dataframe_to_rows
 import datetime
 import pathlib
 
 
+# Default save location when no 'location' is given to save()
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "output")
+
+# openpyxl warns on every add_table() in write-only mode, even though __write_sheet
+# spells the table columns out itself. Filtered once here by exact message rather than
+# with catch_warnings(), which swaps process-wide state and isn't safe off-thread
+warnings.filterwarnings(
+    "ignore", message="In write-only mode you must add table columns manually", category=UserWarning
+)
+
+# DataFrame rows are converted to Python objects this many at a time while writing
+_ROW_CHUNK = 10_000
+
+# Every table uses the same style, so one instance is shared across sheets
+_TABLE_STYLE = TableStyleInfo(
+    name="TableStyleMedium9",
+    showFirstColumn=False,
+    showLastColumn=False,
+    showRowStripes=True,
+    showColumnStripes=False
+)
+
 class ExcelFormatter:
     def __init__(self):
-     # Create a reference to an empty Excel workbook
-        self.wb = Workbook()
+     # Sheets are queued here and streamed into a write-only workbook on save()
+        self._pending = []
         self._table_names = set()
+        self._next_suffix = {}
+     # Single background writer, created on the first async save
+        self._io_pool = None
      
 
     def add_to_sheet(self, df: pd.DataFrame, sheet_name: str, transform_fn = None) -> None:
@@ -33,73 +62,110 @@ class ExcelFormatter:
         :param transform_fn: [IN PROGRESS] Add a lambda function which will take in a df as a paramater for pre-transformation prior to saving the data
         """
 
-        ws = self.wb.active
-     # Check if the default sheet is empty (only check first cell to avoid iterating millions of rows)
-        is_empty = ws.max_row <= 1 and ws.cell(1, 1).value is None
-
-        if is_empty:
-         # Use the default sheet
-            ws.title = sheet_name
-        else:
-         # Create a new sheet
-            ws = self.wb.create_sheet(title=sheet_name)
-
      # Apply transformation to the dataframe
         if transform_fn:
             df = transform_fn(df)
 
-     # Open up the sheet in the workbook
-        if sheet_name in self.wb.sheetnames:
-            ws = self.wb[sheet_name] # Open up the sheet if it already exists 
-        else:
-            ws = self.wb.create_sheet(title=sheet_name)
+     # Format the column widths according to the size of the data in the rows
+     # Sample up to 500 rows to avoid slow iteration on large DataFrames
+     # Longest cell per column via pandas string kernels, then compared with the header
+        sample = df.head(500)
+        cell_lens = sample.astype(str).apply(lambda s: s.str.len()).max().fillna(0).to_numpy(dtype=np.int64)
+        header_lens = np.fromiter((len(str(col)) for col in df.columns), dtype=np.int64, count=len(df.columns))
+        widths = np.minimum(np.maximum(cell_lens, header_lens) + 4, 60).tolist()
+
+     # A copy of the DataFrame is queued (later edits by the caller don't reach the sheet);
+     # rows are converted chunk by chunk at write time
+        self._pending.append((sheet_name, self.__table_name(sheet_name), list(df.columns), df.copy(), widths))
+
+    def add_to_sheet_from_rows(self, rows: Iterable[tuple], columns: list[str], sheet_name: str, sample_widths: bool = False) -> None:
+        """
+        Add already-tabular rows (e.g. a list of tuples or a DB cursor) to a sheet without building a DataFrame.\n
+        The rows are consumed lazily when the workbook is saved, so a cursor must stay open until then.
+        With save(async_save=True) they are drained into a list on the calling thread before the
+        write is handed off, because a sqlite3 cursor can't be read from another thread.
+
+        :param rows: An iterable of row tuples, ordered the same as columns
+        :param columns: The header names for the sheet
+        :param sheet_name: The name of the sheet which will contain the rows
+        :param sample_widths: [OPTIONAL] Size the columns from the first 500 rows as well as the headers (otherwise headers only)
+        """
+        lens = [len(str(col)) for col in columns]
+        if sample_widths:
+            rows = iter(rows)
+            sample = list(itertools.islice(rows, 500))
+            for row in sample:
+                lens = [max(n, len(str(v))) for n, v in zip(lens, row)]
+            rows = itertools.chain(sample, rows)
+        widths = [min(n + 4, 60) for n in lens]
+
+        self._pending.append((sheet_name, self.__table_name(sheet_name), list(columns), rows, widths))
+
+    def __table_name(self, sheet_name: str) -> str:
+        """
+        Create a unique table displayName for the sheet.
+        Suffix probing resumes where the last collision on this base name left off.
+        """
+        display_name = base_name = "".join(sheet_name.split(" "))
+        if display_name in self._table_names:
+            counter = self._next_suffix.get(base_name, 2)
+            while f"{base_name}_{counter}" in self._table_names:
+                counter += 1
+            display_name = f"{base_name}_{counter}"
+            self._next_suffix[base_name] = counter + 1
+        self._table_names.add(display_name)
+        return display_name
+
+    @staticmethod
+    def __frame_rows(df: pd.DataFrame):
+        """
+        Yield a DataFrame's rows as lists, converting one _ROW_CHUNK slice at a time with
+        to_numpy(dtype=object).tolist() so only that slice is ever held as Python objects.
+        """
+        for start in range(0, len(df), _ROW_CHUNK):
+            yield from df.iloc[start:start + _ROW_CHUNK].to_numpy(dtype=object).tolist()
+
+    def __write_sheet(self, wb: Workbook, sheet_name: str, display_name: str, columns: list, rows: Iterable, widths: list) -> None:
+        """
+        Stream one queued sheet into a write-only workbook. Column widths must be set
+        before any rows are written, and rows go straight to disk instead of being held
+        as openpyxl Cell objects.
+        """
+        ws = wb.create_sheet(title=sheet_name)
+        for i, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
 
-     # Save the rows in the dataframe
-        for row in dataframe_to_rows(df, index=False, header=True):
+     # Save the header and then the rows
+        ws.append(columns)
+        num_rows = 1
+        for row in (self.__frame_rows(rows) if isinstance(rows, pd.DataFrame) else rows):
             ws.append(row)
+            num_rows += 1
 
      # Get metadata on rows and columns
-        num_rows = ws.max_row
-        num_cols = ws.max_column
+        num_cols = len(columns)
         table_ref = f"A1:{get_column_letter(num_cols)}{num_rows}"
 
-     # Create and style table with unique displayName
-        display_name = "".join(sheet_name.split(" "))
-        base_name = display_name
-        counter = 2
-        while display_name in self._table_names:
-            display_name = f"{base_name}_{counter}"
-            counter += 1
-        self._table_names.add(display_name)
+     # Create and style the table (write-only sheets need the columns spelled out)
         table = Table(displayName=display_name, ref=table_ref)
-        style = TableStyleInfo(
-            name="TableStyleMedium9",
-            showFirstColumn=False,
-            showLastColumn=False,
-            showRowStripes=True,
-            showColumnStripes=False
-        )
-        table.tableStyleInfo = style 
+        table.tableColumns = [TableColumn(id=i, name=str(col)) for i, col in enumerate(columns, start=1)]
+        table.tableStyleInfo = _TABLE_STYLE
         ws.add_table(table)
 
-     # Format the column widths according to the size of the data in the rows
-     # Sample up to 500 rows to avoid slow iteration on large DataFrames
-        sample = df.head(500)
-        for i, col in enumerate(df.columns, start=1):
-            col_letter = get_column_letter(i)
-            max_len = max(len(str(cell)) for cell in [col] + sample[col].astype(str).tolist())
-            ws.column_dimensions[col_letter].width = min(max_len + 4, 60)
-
-    def save(self, filename: str, location: str = None) -> None:
+    def save(self, filename: str, location: str = None, async_save: bool = False) -> Future | None:
         """
         This method will take in a workbook object and then save it to a file location specified by 'location' \n
         If the 'location' parameter is empty, then it will store the output file to a folder called 'output' located in the relative directory. 
 
         :param filename: The name of the output Excel file which contains the resultant set from DB calls
         :param location: [OPTIONAL] The location in which the Excel file will be stored in the context of your directory structure. 
+        :param async_save: [OPTIONAL] Serialize the workbook on a background thread and return a Future, so the caller can queue the next sheets meanwhile.
+            Queued data is snapshotted before this returns, so later changes to the caller's frames or row lists don't affect the file
         """
      # Craft the full location path of the saved output file
         fpath = location if location else self.__create_output_dir()
+        if fpath is None:
+            return None
 
      # Validate the filename to ensure it is .xlsx 
         path_split = filename.split('.')[1]
@@ -120,41 +186,74 @@ class ExcelFormatter:
 
      # Save the file to the specified location if it exists
         spath = os.path.join(fpath, filename)
-        self.wb.save(spath)
+        if async_save:
+         # Snapshot the queue on the calling thread: DataFrames were already copied by
+         # add_to_sheet, and every row source (lists, generators, DB cursors) is copied or
+         # drained into a new list, since a sqlite3 cursor can't be read from the writer
+         # thread. The queue is then cleared so new sheets can be added while the save runs
+            pending = [
+                entry if isinstance(entry[3], pd.DataFrame) else (*entry[:3], list(entry[3]), entry[4])
+                for entry in self._pending
+            ]
+            self.__reset_workbook()
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=1)
+
+            def report(future):
+                if future.exception() is None:
+                    print(f"Saved the output workbook succesfully to {spath}\n")
+
+            future = self._io_pool.submit(self.__write_workbook, pending, spath)
+            future.add_done_callback(report)
+            return future
+
+        self.__write_workbook(self._pending, spath)
         self.__reset_workbook()
 
         print(f"Saved the output workbook succesfully to {spath}\n")
 
+    def close(self) -> None:
+        """
+        Wait for any background saves to finish and shut down the writer thread.
+        """
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+
+    def __write_workbook(self, pending: list, spath: str) -> None:
+        """
+        Build a write-only workbook from the queued sheets and save it to spath.
+        """
+        wb = Workbook(write_only=True)
+        for entry in pending:
+            self.__write_sheet(wb, *entry)
+        if not pending:
+            wb.create_sheet(title="Sheet")
+        wb.save(spath)
+
     def __create_output_dir(self) -> str:
         """
         Create a folder called 'output' in the relative directory.\n
         To be used in the 'save' method as a means to create the output directory seamlessly
         """
 
-     # Get the base directory path 
-        base_dir = str(pathlib.Path(__file__).parent)
-     # Join the base_dir and the 'output' folder
-        o_dir = base_dir + '\output'
-     # Create a folder called 'output' in the base_dir
-        if not os.path.exists(o_dir):
-            try:
-                os.mkdir(o_dir)
-            except FileExistsError:
-                print(f"Directory {o_dir} already exists.")
-                pass # Continue with the logical flow
-            except PermissionError:
-                print(f"Permission denied: Unable to create '{o_dir}'")
-                self.__reset_workbook()
-                return None
-            except Exception as e:
-                print(f"An error occurred: {e}")
-                self.__reset_workbook()
-                return None
+     # Create a folder called 'output' next to this module (no-op if it already exists)
+        try:
+            os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+        except PermissionError:
+            print(f"Permission denied: Unable to create '{DEFAULT_OUTPUT_DIR}'")
+            self.__reset_workbook()
+            return None
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            self.__reset_workbook()
+            return None
 
      # Return the output directory path 
-        return os.path.realpath(o_dir)
+        return DEFAULT_OUTPUT_DIR
 
     def __reset_workbook(self):
         print(f"Resetting the Excel workbook...")
-        self.wb = Workbook()
-        self._table_names = set()
\ No newline at end of file
+        self._pending = []
+        self._table_names = set()
+        self._next_suffix = {}
\ No newline at end of file
@@ -2,40 +2,134 @@
 Color-coded logging utilities for the pipeline.
 
 Provides consistent, color-coded console output across all pipeline scripts.
-Uses colorama for cross-platform terminal color support.
+Writes ANSI colors directly; colorama is only used on Windows consoles.
 """
 
-import datetime
+import atexit
+import functools
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-
-from colorama import Fore, Style, init
-
-# Initialize colorama (auto-reset after each print)
-init(autoreset=True)
+import time
+
+if os.environ.get("NO_COLOR"):
+    # https://no-color.org: any non-empty value turns color off everywhere
+    _COLOR = False
+    _EOL = "\n"
+elif sys.platform == "win32":
+    # colorama turns the ANSI codes into console calls (or strips them when
+    # piped) and resets the style after every write
+    from colorama import init
+    init(autoreset=True)
+    _COLOR = True
+    _EOL = "\n"
+else:
+    # ANSI is native here, so skip colorama's per-write wrapper: drop the codes
+    # when stdout isn't a terminal and reset at the end of each emitted line
+    _COLOR = sys.stdout.isatty()
+    _EOL = "\x1b[0m\n" if _COLOR else "\n"
 
 
 # ---------------------------------------------------------------------------
 # Color constants for pipeline stages
 # ---------------------------------------------------------------------------
 
+if _COLOR:
+    _HEADER = "\x1b[36m\x1b[1m"  # cyan, bright
+    _STEP = "\x1b[34m\x1b[1m"    # blue, bright
+    _OK = "\x1b[32m\x1b[1m"      # green, bright
+    _WARN = "\x1b[33m\x1b[1m"    # yellow, bright
+    _ERR = "\x1b[31m\x1b[1m"     # red, bright
+    _INFO = "\x1b[37m"           # white
+    _DIM = "\x1b[2m"
+    _TICKER = "\x1b[35m\x1b[1m"  # magenta, bright
+    _SECTOR = "\x1b[36m"         # cyan
+    _VALUE = "\x1b[32m"          # green
+    _RESET = "\x1b[0m"
+else:
+    _HEADER = _STEP = _OK = _WARN = _ERR = _INFO = _DIM = _TICKER = _SECTOR = _VALUE = _RESET = ""
+
+
 class C:
-    """Color shortcuts for pipeline output."""
-    HEADER = Fore.CYAN + Style.BRIGHT
-    STEP = Fore.BLUE + Style.BRIGHT
-    OK = Fore.GREEN + Style.BRIGHT
-    WARN = Fore.YELLOW + Style.BRIGHT
-    ERR = Fore.RED + Style.BRIGHT
-    INFO = Fore.WHITE
-    DIM = Style.DIM
-    TICKER = Fore.MAGENTA + Style.BRIGHT
-    SECTOR = Fore.CYAN
-    VALUE = Fore.GREEN
-    RESET = Style.RESET_ALL
+    """Color shortcuts for pipeline output (for callers building colored messages)."""
+    HEADER = _HEADER
+    STEP = _STEP
+    OK = _OK
+    WARN = _WARN
+    ERR = _ERR
+    INFO = _INFO
+    DIM = _DIM
+    TICKER = _TICKER
+    SECTOR = _SECTOR
+    VALUE = _VALUE
+    RESET = _RESET
+
+
+def _env_level() -> int:
+    """Minimum level from LOG_LEVEL (a number or a name like WARNING), default INFO."""
+    raw = os.environ.get("LOG_LEVEL", "").strip()
+    if raw.isdigit():
+        return int(raw)
+    level = logging.getLevelName(raw.upper()) if raw else logging.INFO
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _env_flag(name: str) -> bool:
+    """True when the env var is set to anything but empty/0/false/no."""
+    return os.environ.get(name, "").strip().lower() not in ("", "0", "false", "no")
+
+
+_MIN_LEVEL = _env_level()
+
+# Checked first thing in the emitters, before any timestamp or formatting work:
+# LOG_QUIET silences all console output, LOG_PROGRESS_QUIET just progress(), and
+# a LOG_LEVEL above INFO silences the chatty per-item emitters
+_QUIET = _env_flag("LOG_QUIET")
+_CHATTY_OFF = _QUIET or _MIN_LEVEL > logging.INFO
+_PROGRESS_OFF = _CHATTY_OFF or _env_flag("LOG_PROGRESS_QUIET")
+
+
+_RULE = "=" * 60
+
+# %-templates for the single-line emitters, assembled once from the colors above
+_STEP_FMT = _STEP + "[%s] >> %s" + _RESET
+_INFO_FMT = _DIM + "[%s]" + _RESET + " %s"
+_OK_FMT = _OK + "[%s] OK %s" + _RESET
+_WARN_FMT = _WARN + "[%s] WARN %s" + _RESET
+_ERR_FMT = _ERR + "[%s] ERR %s" + _RESET
+_TICKER_FMT = _DIM + "[%s]" + _RESET + " " + _TICKER + "%s" + _RESET + " %s"
+_PROGRESS_FMT = (
+    _DIM + "[%s]" + _RESET + " " + _STEP + "[%s/%s]" + _RESET + " " + _TICKER + "%s" + _RESET + ": %s"
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _ts_for_second(sec: int) -> str:
+    return time.strftime("%H:%M:%S", time.localtime(sec))
 
 
 def _ts() -> str:
-    return datetime.datetime.now().strftime("%H:%M:%S")
+    """Local HH:MM:SS, formatted at most once per second."""
+    return _ts_for_second(int(time.time()))
+
+
+def _emit(text: str, flush: bool = False) -> None:
+    """
+    Write text plus line ending to stdout in one call (print() issues two writes).
+    Piped stdout is block-buffered, so warnings and errors pass flush=True to show
+    up immediately; everything else rides the buffer unless LOG_LEVEL is WARNING+.
+    """
+    out = sys.stdout
+    out.write(text + _EOL)
+    if flush or _MIN_LEVEL >= logging.WARNING:
+        out.flush()
+
+
+def flush() -> None:
+    """Flush any log output still sitting in stdout's buffer."""
+    sys.stdout.flush()
 
 
 # ---------------------------------------------------------------------------
@@ -44,64 +138,109 @@ def _ts() -> str:
 
 def header(msg: str) -> None:
     """Print a bold section header."""
-    print(f"\n{C.HEADER}{'='*60}")
-    print(f"  {msg}")
-    print(f"{'='*60}{C.RESET}\n")
+    if _QUIET:
+        return
+    _emit(f"\n{_HEADER}{_RULE}\n  {msg}\n{_RULE}{_RESET}\n")
 
 
 def step(msg: str) -> None:
     """Print a pipeline step."""
-    print(f"{C.STEP}[{_ts()}] >> {msg}{C.RESET}")
+    if _QUIET:
+        return
+    _emit(_STEP_FMT % (_ts(), msg))
 
 
 def info(msg: str) -> None:
     """Print an info message."""
-    print(f"{C.DIM}[{_ts()}]{C.RESET} {msg}")
+    if _CHATTY_OFF:
+        return
+    _emit(_INFO_FMT % (_ts(), msg))
 
 
 def ok(msg: str) -> None:
     """Print a success message."""
-    print(f"{C.OK}[{_ts()}] OK {msg}{C.RESET}")
+    if _QUIET:
+        return
+    _emit(_OK_FMT % (_ts(), msg))
 
 
 def warn(msg: str) -> None:
     """Print a warning."""
-    print(f"{C.WARN}[{_ts()}] WARN {msg}{C.RESET}")
+    if _QUIET:
+        return
+    _emit(_WARN_FMT % (_ts(), msg), flush=True)
 
 
 def err(msg: str) -> None:
     """Print an error."""
-    print(f"{C.ERR}[{_ts()}] ERR {msg}{C.RESET}")
+    if _QUIET:
+        return
+    _emit(_ERR_FMT % (_ts(), msg), flush=True)
 
 
 def ticker_msg(ticker: str, msg: str) -> None:
     """Print a ticker-scoped message."""
-    print(f"{C.DIM}[{_ts()}]{C.RESET} {C.TICKER}{ticker}{C.RESET} {msg}")
+    if _CHATTY_OFF:
+        return
+    _emit(_TICKER_FMT % (_ts(), ticker, msg))
 
 
 def progress(current: int, total: int, ticker: str, msg: str) -> None:
     """Print a progress line like [3/21] AAPL: ..."""
-    pct = (current / total) * 100 if total else 0
-    print(
-        f"{C.DIM}[{_ts()}]{C.RESET} "
-        f"{C.STEP}[{current}/{total}]{C.RESET} "
-        f"{C.TICKER}{ticker}{C.RESET}: {msg}"
-    )
+    if _PROGRESS_OFF:
+        return
+    _emit(_PROGRESS_FMT % (_ts(), current, total, ticker, msg))
 
 
 def summary_table(title: str, rows: list[tuple[str, str]]) -> None:
     """Print a summary table with label-value pairs."""
-    print(f"\n{C.HEADER}{title}{C.RESET}")
-    max_label = max(len(r[0]) for r in rows) if rows else 0
-    for label, value in rows:
-        print(f"  {label:<{max_label}}  {C.VALUE}{value}{C.RESET}")
-    print()
+    if _QUIET:
+        return
+    max_label = max((len(r[0]) for r in rows), default=0)
+    lines = [f"\n{_HEADER}{title}{_RESET}"]
+    lines.extend(f"  {label:<{max_label}}  {_VALUE}{value}{_RESET}" for label, value in rows)
+    lines.append("")
+    _emit("\n".join(lines))
 
 
 # ---------------------------------------------------------------------------
 # Verbose logging setup
 # ---------------------------------------------------------------------------
 
+# <repo>/logs, resolved once at import
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+# QueueHandler shared by every verbose logger; see _file_queue_handler()
+_file_handler = None
+
+
+def _file_queue_handler(fmt: logging.Formatter) -> logging.Handler:
+    """
+    Return the shared handler that feeds logs/pipeline.log. Records are queued
+    and written by a single QueueListener thread, batched through a MemoryHandler
+    (errors, and the listener stop + logging.shutdown() at exit, flush it).
+    """
+    global _file_handler
+    if _file_handler is None:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        fh = logging.FileHandler(os.path.join(LOG_DIR, "pipeline.log"))
+        fh.setLevel(logging.DEBUG)
+        fh.setFormatter(fmt)
+        bh = logging.handlers.MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=fh)
+        bh.setLevel(logging.DEBUG)
+
+        records = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(records, bh)
+        listener.start()
+        # Registered after logging's own atexit hook, so it runs first and
+        # drains the queue before the handlers are flushed and closed
+        atexit.register(listener.stop)
+
+        _file_handler = logging.handlers.QueueHandler(records)
+        _file_handler.setLevel(logging.DEBUG)
+    return _file_handler
+
+
 def setup_verbose_logging(name: str = "pipeline", level: int = logging.DEBUG) -> logging.Logger:
     """
     Create a verbose logger that writes to both console and logs/pipeline.log.
@@ -124,13 +263,7 @@ def setup_verbose_logging(name: str = "pipeline", level: int = logging.DEBUG) ->
     ch.setFormatter(fmt)
     logger.addHandler(ch)
 
-    # File handler (DEBUG+)
-    import os
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    fh = logging.FileHandler(os.path.join(log_dir, "pipeline.log"))
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
+    # File handler (DEBUG+), written from a background thread
+    logger.addHandler(_file_queue_handler(fmt))
 
     return logger
@@ -4,6 +4,7 @@ from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
 import requests
 import datetime
 import time, random
+import threading
 import logging 
 import logging.config
 
@@ -15,6 +16,30 @@ def get_logging_config() -> dict:
 
     return config_dict
 
+class RateLimiter():
+    """
+    Thread-safe token bucket. acquire() blocks until a request may be sent,
+    allowing at most `rate` requests per second once the initial burst is spent.
+    """
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+     # Take a token even if the bucket is short; a negative balance is this caller's
+     # place in line, slept off outside the lock (no retry loop to spin on rounding)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
 class RequestSession():
     def __init__(self, headers=None):
         print(f"\n[REQUEST SESSION] - {datetime.datetime.now()} - Initializing the session now...")
@@ -38,8 +63,12 @@ class RequestSession():
         self.logger.info("Logging has been configured using the JSON file.")
 
 
-    def get(self, url: str|bytes, params=None) -> bytes:
-        time.sleep(random.uniform(2, 5))
+    def get(self, url: str|bytes, params=None, rate_limiter: RateLimiter | None = None) -> bytes:
+     # Pace the request: a shared RateLimiter replaces the random 2-5s politeness delay
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        else:
+            time.sleep(random.uniform(2, 5))
 
     # Make the HTTP request
         try: